@@ -0,0 +1,54 @@
+"""
+Shared format of the finished-event archive written by archive_events.py and
+read by get_event.py.
+
+Each archived root event is one gzipped JSONL object in the archive bucket
+holding the event, its descendant events and all their registrations, matches
+and standings rows, one record per line:
+
+    {"type": "event", "item": {...}}
+
+The archive index table maps every archived event id to its object and keeps a
+copy of the event item, so a plain lookup of an archived event costs one get_item.
+"""
+import gzip
+import json
+from decimal import Decimal
+
+RECORD_EVENT = 'event'
+RECORD_REGISTRATION = 'registration'
+RECORD_MATCH = 'match'
+RECORD_STANDING = 'standing'
+
+# Root events carry archive_key = ROOT_ARCHIVE_KEY and child events do not, so
+# archive_key-date_end-index holds exactly the events the archival sweep looks for
+ROOT_ARCHIVE_KEY = 'root'
+
+# Set on hot items right before archive_events deletes them, so stream consumers
+# can tell an archival REMOVE from an item that was really deleted
+ARCHIVED_ATTRIBUTE = 'archived'
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, set):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value):
+    return json.dumps(value, default=_json_default, separators=(',', ':'))
+
+
+def object_key(root_event_id):
+    return f"events/{root_event_id}.jsonl.gz"
+
+
+def encode(records):
+    lines = ''.join(dumps({'type': record_type, 'item': item}) + '\n' for record_type, item in records)
+    return gzip.compress(lines.encode())
+
+
+def decode(data):
+    return [json.loads(line) for line in gzip.decompress(data).decode().splitlines() if line]
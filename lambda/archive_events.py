@@ -0,0 +1,264 @@
+import boto3
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from boto3.dynamodb.conditions import Attr, Key
+import archive
+from batch_fetch import query_all
+from profiling import profiled
+from warmup import warm
+
+dynamodb = boto3.resource('dynamodb')
+# Items are marked from worker threads, which must share the thread-safe client
+client = dynamodb.meta.client
+s3 = boto3.client('s3')
+events_table = dynamodb.Table(os.environ['EVENTS_TABLE'])
+registrations_table = dynamodb.Table(os.environ['EVENT_REGISTRATIONS_TABLE'])
+matches_table = dynamodb.Table(os.environ['MATCHES_TABLE'])
+standings_table = dynamodb.Table(os.environ['STANDINGS_TABLE'])
+archive_index_table = dynamodb.Table(os.environ['ARCHIVE_INDEX_TABLE'])
+ARCHIVE_BUCKET = os.environ['ARCHIVE_BUCKET']
+
+RETENTION_DAYS = int(os.environ.get('ARCHIVE_RETENTION_DAYS', 180))
+# Leave headroom before the Lambda timeout; the next run picks up the rest
+TIME_BUDGET_SECONDS = int(os.environ.get('ARCHIVE_TIME_BUDGET_SECONDS', 240))
+MARK_WORKERS = 8
+
+
+def finished_root_events(cutoff):
+    """Yield ids of top-level events that ended before `cutoff`, a page at a time"""
+    kwargs = {
+        'IndexName': 'archive_key-date_end-index',
+        'KeyConditionExpression': Key('archive_key').eq(archive.ROOT_ARCHIVE_KEY) & Key('date_end').lt(cutoff),
+        'ProjectionExpression': 'id'
+    }
+    while True:
+        response = events_table.query(**kwargs)
+        for item in response.get('Items', []):
+            yield item['id']
+        if 'LastEvaluatedKey' not in response:
+            return
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def backfill_archive_keys():
+    """One-off scan tagging root events created before archive_key existed; returns how many it tagged"""
+    kwargs = {
+        'FilterExpression': Attr('parent_event_id').not_exists() & Attr('archive_key').not_exists(),
+        'ProjectionExpression': 'id'
+    }
+    tagged = 0
+    while True:
+        response = events_table.scan(**kwargs)
+        for item in response.get('Items', []):
+            try:
+                events_table.update_item(
+                    Key={'id': item['id']},
+                    UpdateExpression='SET archive_key = :root',
+                    ConditionExpression='attribute_exists(id) AND attribute_not_exists(parent_event_id)',
+                    ExpressionAttributeValues={':root': archive.ROOT_ARCHIVE_KEY}
+                )
+                tagged += 1
+            except events_table.meta.client.exceptions.ConditionalCheckFailedException:
+                pass  # deleted meanwhile
+        if 'LastEvaluatedKey' not in response:
+            return tagged
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def collect_tree(root_event_id):
+    """The root event, every descendant event and the rows hanging off each of them"""
+    root = events_table.get_item(Key={'id': root_event_id}, ConsistentRead=True).get('Item')
+    if root is None:
+        return []
+
+    events = [root]
+    frontier = [root_event_id]
+    while frontier:
+        parent_id = frontier.pop()
+        children = query_all(
+            events_table,
+            IndexName='parent_event_id-index',
+            KeyConditionExpression=Key('parent_event_id').eq(parent_id)
+        )
+        events.extend(children)
+        frontier.extend(child['id'] for child in children)
+
+    records = [(archive.RECORD_EVENT, event) for event in events]
+    for event in events:
+        by_event = Key('event_id').eq(event['id'])
+        records += [(archive.RECORD_REGISTRATION, item) for item in query_all(registrations_table, KeyConditionExpression=by_event)]
+        records += [(archive.RECORD_MATCH, item) for item in query_all(matches_table, KeyConditionExpression=by_event)]
+        records += [(archive.RECORD_STANDING, item) for item in query_all(standings_table, KeyConditionExpression=by_event)]
+    return records
+
+
+KEY_NAMES = {
+    archive.RECORD_EVENT: ('id',),
+    archive.RECORD_REGISTRATION: ('event_id', 'team_id'),
+    archive.RECORD_MATCH: ('event_id', 'match_id'),
+    archive.RECORD_STANDING: ('event_id', 'team_id')
+}
+
+
+def record_key(record_type, item):
+    return tuple(item[name] for name in KEY_NAMES[record_type])
+
+
+def mark_archived(table, keys):
+    """
+    Set ARCHIVED_ATTRIBUTE on items about to be deleted, so stream_counters leaves
+    their counters alone when the REMOVE arrives. Items already gone are skipped.
+    """
+    def mark(key):
+        try:
+            client.update_item(
+                TableName=table.name,
+                Key=key,
+                UpdateExpression='SET #archived = :true',
+                ConditionExpression='attribute_exists(#key)',
+                ExpressionAttributeNames={'#archived': archive.ARCHIVED_ATTRIBUTE, '#key': next(iter(key))},
+                ExpressionAttributeValues={':true': True}
+            )
+        except client.exceptions.ConditionalCheckFailedException:
+            pass  # deleted by an earlier run
+
+    with ThreadPoolExecutor(max_workers=MARK_WORKERS) as executor:
+        list(executor.map(mark, keys))
+
+
+def event_levels(root_event_id, events):
+    """Event ids grouped by depth below the root: [[root], [children], [grandchildren], ...]"""
+    children = {}
+    for event in events:
+        if event.get('parent_event_id'):
+            children.setdefault(event['parent_event_id'], []).append(event['id'])
+    levels = [[root_event_id]]
+    while True:
+        level = [child for parent_id in levels[-1] for child in children.get(parent_id, [])]
+        if not level:
+            return levels
+        levels.append(level)
+
+
+def archive_tree(root_event_id):
+    """
+    Write the tree to S3 and the index, then delete it from the hot tables.
+    Every step is idempotent, so a run interrupted part-way is completed by the next one.
+    """
+    records = collect_tree(root_event_id)
+    if not records:
+        return 0
+    # Items an interrupted run marked but did not delete are archived as they were
+    for _, item in records:
+        item.pop(archive.ARCHIVED_ATTRIBUTE, None)
+
+    # A previous run may have deleted part of the tree before failing; keep what it archived
+    key = archive.object_key(root_event_id)
+    try:
+        previous = archive.decode(s3.get_object(Bucket=ARCHIVE_BUCKET, Key=key)['Body'].read())
+    except s3.exceptions.NoSuchKey:
+        previous = []
+    if previous:
+        merged = {}
+        for record_type, item in [(r['type'], r['item']) for r in previous] + records:
+            merged[(record_type, record_key(record_type, item))] = (record_type, item)
+        records = list(merged.values())
+
+    s3.put_object(
+        Bucket=ARCHIVE_BUCKET,
+        Key=key,
+        Body=archive.encode(records),
+        ContentType='application/gzip'
+    )
+
+    archived_at = datetime.utcnow().isoformat()
+    with archive_index_table.batch_writer(overwrite_by_pkeys=['event_id']) as batch:
+        for record_type, item in records:
+            if record_type == archive.RECORD_EVENT:
+                batch.put_item(Item={
+                    'event_id': item['id'],
+                    'root_event_id': root_event_id,
+                    's3_key': key,
+                    'archived_at': archived_at,
+                    'event': archive.dumps(item)
+                })
+
+    # Events go last so an interrupted run still finds the root on the next sweep.
+    # Only events and registrations feed stream_counters, so only they are marked
+    hot_tables = [
+        (archive.RECORD_REGISTRATION, registrations_table, True),
+        (archive.RECORD_MATCH, matches_table, False),
+        (archive.RECORD_STANDING, standings_table, False)
+    ]
+    for record_type, table, counted in hot_tables:
+        keys = [dict(zip(KEY_NAMES[record_type], record_key(record_type, item)))
+                for rtype, item in records if rtype == record_type]
+        if counted:
+            mark_archived(table, keys)
+        with table.batch_writer() as batch:
+            for key in keys:
+                batch.delete_item(Key=key)
+
+    # Leaves first, one level per flush, root last: whatever an interrupted run leaves
+    # behind is still reachable from the root through parent_event_id-index
+    levels = event_levels(root_event_id, [item for rtype, item in records if rtype == archive.RECORD_EVENT])
+    for level in reversed(levels[1:]):
+        mark_archived(events_table, [{'id': event_id} for event_id in level])
+        with events_table.batch_writer() as batch:
+            for event_id in level:
+                batch.delete_item(Key={'id': event_id})
+    mark_archived(events_table, [{'id': root_event_id}])
+    events_table.delete_item(Key={'id': root_event_id})
+    return len(records)
+
+
+@warm(tables=[events_table, registrations_table, matches_table, standings_table, archive_index_table])
+@profiled
+def lambda_handler(event, context):
+    """
+    Scheduled sweep that moves events finished more than ARCHIVE_RETENTION_DAYS
+    ago, with all their descendants, from the hot tables to the archive bucket.
+    Invoke it once with {"backfill": true} to tag root events that predate archive_key.
+    """
+    if event.get('backfill'):
+        try:
+            tagged = backfill_archive_keys()
+            print(f"Tagged {tagged} root events with archive_key")
+            return {
+                'statusCode': 200,
+                'body': json.dumps({'tagged_events': tagged})
+            }
+        except Exception as e:
+            print(f"Error tagging root events: {str(e)}")
+            return {
+                'statusCode': 500,
+                'body': json.dumps({'error': str(e)})
+            }
+
+    started = time.monotonic()
+    cutoff = (datetime.utcnow() - timedelta(days=RETENTION_DAYS)).date().isoformat()
+
+    archived_events = 0
+    archived_records = 0
+    try:
+        for root_event_id in finished_root_events(cutoff):
+            if time.monotonic() - started > TIME_BUDGET_SECONDS:
+                break
+            archived_records += archive_tree(root_event_id)
+            archived_events += 1
+
+        print(f"Archived {archived_events} events ({archived_records} records) that ended before {cutoff}")
+        return {
+            'statusCode': 200,
+            'body': json.dumps({'archived_events': archived_events, 'archived_records': archived_records, 'cutoff': cutoff})
+        }
+
+    except Exception as e:
+        print(f"Error archiving events: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': str(e)})
+        }
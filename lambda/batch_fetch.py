@@ -0,0 +1,62 @@
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BATCH_GET_LIMIT = 100  # keys per BatchGetItem call
+MAX_WORKERS = 4
+MAX_ATTEMPTS = 6
+
+
+def _get_chunk(client, table_name, keys, extra):
+    request = {table_name: {'Keys': keys, **extra}}
+    items = []
+    for attempt in range(MAX_ATTEMPTS):
+        response = client.batch_get_item(RequestItems=request)
+        items.extend(response['Responses'].get(table_name, []))
+        request = response.get('UnprocessedKeys') or {}
+        if not request:
+            return items
+        time.sleep(0.02 * (2 ** attempt) * random.uniform(0.5, 1.5))
+    raise RuntimeError(f"Keys from {table_name} still unprocessed after {MAX_ATTEMPTS} attempts")
+
+
+def batch_get_items(client, table_name, keys, projection=None, consistent_read=False):
+    """
+    Fetch items by key with BatchGetItem. Duplicate keys are dropped, keys are
+    split into chunks of 100 and chunks are fetched concurrently, retrying
+    UnprocessedKeys with backoff. `client` must be a low-level client (for a
+    resource use dynamodb.meta.client), since it is shared across threads.
+    `projection` takes the kwargs built by fieldsets.projection_kwargs.
+    """
+    unique = {}
+    for key in keys:
+        unique.setdefault(json.dumps(key, sort_keys=True, default=str), key)
+    keys = list(unique.values())
+    if not keys:
+        return []
+
+    extra = dict(projection or {})
+    if consistent_read:
+        extra['ConsistentRead'] = True
+    chunks = [keys[i:i + BATCH_GET_LIMIT] for i in range(0, len(keys), BATCH_GET_LIMIT)]
+    if len(chunks) == 1:
+        return _get_chunk(client, table_name, chunks[0], extra)
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(chunks))) as executor:
+        results = executor.map(lambda chunk: _get_chunk(client, table_name, chunk, extra), chunks)
+        return [item for chunk_items in results for item in chunk_items]
+
+
+def query_all(source, **kwargs):
+    """
+    Every item of a paginated query. `source` is a Table, or the low-level client
+    (with TableName in kwargs) when the query runs on a worker thread.
+    """
+    items = []
+    while True:
+        response = source.query(**kwargs)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return items
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
@@ -0,0 +1,44 @@
+import base64
+import gzip
+import os
+
+# Bodies smaller than this are cheaper to send as-is than to compress
+GZIP_MIN_BYTES = int(os.environ.get('GZIP_MIN_BYTES', 1024))
+GZIP_LEVEL = 6
+
+
+def accepts_gzip(event):
+    headers = event.get('headers') or {}
+    for name, value in headers.items():
+        if name.lower() == 'accept-encoding':
+            return 'gzip' in value.lower()
+    return False
+
+
+def compress_response(event, response, min_bytes=GZIP_MIN_BYTES):
+    """
+    Gzip the body of an API Gateway proxy response when the client accepts it
+    and the body is at least `min_bytes` long. API Gateway decodes the base64
+    body before sending the compressed bytes to the client.
+    """
+    body = response.get('body')
+    if not isinstance(body, str) or response.get('isBase64Encoded'):
+        return response
+    if not accepts_gzip(event):
+        return response
+
+    raw = body.encode()
+    if len(raw) < min_bytes:
+        return response
+
+    compressed = gzip.compress(raw, compresslevel=GZIP_LEVEL)
+    return {
+        **response,
+        'headers': {
+            **response.get('headers', {}),
+            'Content-Encoding': 'gzip',
+            'Vary': 'Accept-Encoding'
+        },
+        'body': base64.b64encode(compressed).decode(),
+        'isBase64Encoded': True
+    }
@@ -2,18 +2,34 @@ import boto3
 import uuid
 import json
 import os
+import archive
+from idempotency import idempotent
+from validation import compile_schema, validated
+from profiling import profiled
+from warmup import warm
 
 dynamodb = boto3.resource('dynamodb')
 events_table = dynamodb.Table(os.environ['EVENTS_TABLE'])
 
+validate_body = compile_schema({
+    'organizer_id': {'type': 'string', 'required': True, 'max_length': 128},
+    'event_name': {'type': 'string', 'required': True, 'max_length': 200},
+    'date_start': {'type': 'date'},
+    'date_end': {'type': 'date'},
+    'parent_event_id': {'type': 'string', 'max_length': 128},
+    'location': {'type': 'string', 'max_length': 500},
+    'additional_info': {'type': 'string', 'max_length': 5000}
+}, checks=[
+    ('date_end', 'must not be before date_start',
+     lambda body: not body.get('date_start') or not body.get('date_end') or body['date_end'] >= body['date_start'])
+])
+
+@warm(tables=[events_table])
+@profiled
+@validated(validate_body, allow_headers='Content-Type, Idempotency-Key')
+@idempotent('create_event')
 def lambda_handler(event, context):
-    if 'body' in event:
-        if isinstance(event['body'], str):
-            body = json.loads(event['body'])
-        else:
-            body = event['body']
-    else:
-        body = event
+    body = event['body']
 
     organizer_id = body['organizer_id']
     event_name = body['event_name']
@@ -28,7 +44,8 @@ def lambda_handler(event, context):
         'id': event_id,
         'name': event_name,
         'organizer_id': organizer_id,
-        'status': 'unpublished'  # Default status
+        'status': 'unpublished',  # Default status
+        'version': 1
     }
     if date_start:
         item['date_start'] = date_start
@@ -36,6 +53,8 @@ def lambda_handler(event, context):
         item['date_end'] = date_end
     if parent_event_id:
         item['parent_event_id'] = parent_event_id
+    else:
+        item['archive_key'] = archive.ROOT_ARCHIVE_KEY
     if location:
         item['location'] = location
     if additional_info:
@@ -46,6 +65,7 @@ def lambda_handler(event, context):
 
     return {
         'statusCode': 200,
+        'headers': {'ETag': '"1"'},
         'body': json.dumps({'result': 'success', 'response': response})
     }
 
@@ -2,18 +2,26 @@ import boto3
 import uuid
 import json
 import os
+from idempotency import idempotent
+from validation import compile_schema, validated
+from profiling import profiled
+from warmup import warm
 
 dynamodb = boto3.resource('dynamodb')
 teams_table = dynamodb.Table(os.environ['TEAMS_TABLE'])
 
+validate_body = compile_schema({
+    'team_captain_id': {'type': 'string', 'required': True, 'max_length': 128},
+    'team_name': {'type': 'string', 'required': True, 'max_length': 200},
+    'parent_team_id': {'type': 'string', 'max_length': 128}
+})
+
+@warm(tables=[teams_table])
+@profiled
+@validated(validate_body, allow_headers='Content-Type, Idempotency-Key')
+@idempotent('create_team')
 def lambda_handler(event, context):
-    if 'body' in event:
-        if isinstance(event['body'], str):
-            body = json.loads(event['body'])
-        else:
-            body = event['body']
-    else:
-        body = event
+    body = event['body']
 
     team_captain_id = body['team_captain_id']
     team_name = body['team_name']
@@ -24,7 +32,8 @@ def lambda_handler(event, context):
         'id': team_id,
         'name': team_name,
         'team_captain_id': team_captain_id,
-        'members': [team_captain_id]  # Team captain is initially the only member
+        'members': [team_captain_id],  # Team captain is initially the only member
+        'version': 1
     }
     if parent_team_id:
         item['parent_team_id'] = parent_team_id
@@ -34,6 +43,7 @@ def lambda_handler(event, context):
 
     return {
         'statusCode': 200,
+        'headers': {'ETag': '"1"'},
         'body': json.dumps({'result': 'success', 'id': team_id})
     }
 
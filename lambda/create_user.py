@@ -5,20 +5,36 @@ import uuid
 import hashlib
 from datetime import datetime
 from boto3.dynamodb.conditions import Key
+from idempotency import idempotent, stored_response
+from validation import compile_schema, validated
+from rate_limit import RateLimiter, rate_limited
+from profiling import profiled
+from warmup import warm
 
 dynamodb = boto3.resource('dynamodb')
 table = dynamodb.Table(os.environ['USER_TABLE'])
 
+signup_limiter = RateLimiter('signup-ip', burst=5, refill_per_second=0.1, window_limit=20, window_seconds=3600)
+
+validate_body = compile_schema({
+    'username': {'type': 'string', 'required': True, 'max_length': 128},
+    'password': {'type': 'string', 'required': True, 'max_length': 1024},
+    'first_name': {'type': 'string', 'max_length': 200},
+    'last_name': {'type': 'string', 'max_length': 200},
+    'email': {'type': 'string', 'max_length': 254},
+    'phone_number': {'type': 'string', 'max_length': 32},
+    'extra_info': {'type': 'object'}
+})
+
+@warm(tables=[table])
+@profiled
+@validated(validate_body, allow_headers='Content-Type, Idempotency-Key')
+@rate_limited(signup_limiter, allow_headers='Content-Type, Idempotency-Key',
+              replay=lambda event: stored_response('create_user', event))
+@idempotent('create_user')
 def lambda_handler(event, context):
     try:
-        # Parse the request body
-        if 'body' in event:
-            if isinstance(event['body'], str):
-                body = json.loads(event['body'])
-            else:
-                body = event['body']
-        else:
-            body = event
+        body = event['body']
 
         # Extract username and password from request
         username = body.get('username')
@@ -39,7 +55,7 @@ def lambda_handler(event, context):
                     'Content-Type': 'application/json',
                     'Access-Control-Allow-Origin': '*',
                     'Access-Control-Allow-Methods': 'POST, OPTIONS',
-                    'Access-Control-Allow-Headers': 'Content-Type'
+                    'Access-Control-Allow-Headers': 'Content-Type, Idempotency-Key'
                 },
                 'body': json.dumps({
                     'error': 'Username and password are required'
@@ -59,7 +75,7 @@ def lambda_handler(event, context):
                         'Content-Type': 'application/json',
                         'Access-Control-Allow-Origin': '*',
                         'Access-Control-Allow-Methods': 'POST, OPTIONS',
-                        'Access-Control-Allow-Headers': 'Content-Type'
+                        'Access-Control-Allow-Headers': 'Content-Type, Idempotency-Key'
                     },
                     'body': json.dumps({
                         'error': 'Username already exists'
@@ -109,7 +125,7 @@ def lambda_handler(event, context):
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Methods': 'POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type'
+                'Access-Control-Allow-Headers': 'Content-Type, Idempotency-Key'
             },
             'body': json.dumps({
                 'message': 'User created successfully',
@@ -125,7 +141,7 @@ def lambda_handler(event, context):
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Methods': 'POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type'
+                'Access-Control-Allow-Headers': 'Content-Type, Idempotency-Key'
             },
             'body': json.dumps({
                 'error': 'Internal server error',
@@ -1,19 +1,23 @@
 import boto3
 import json
 import os
+from validation import compile_schema, validated
+from profiling import profiled
+from warmup import warm
 
 dynamodb = boto3.resource('dynamodb')
 events_table = dynamodb.Table(os.environ['EVENTS_TABLE'])
 
+validate_body = compile_schema({
+    'organizer_id': {'type': 'string', 'required': True, 'max_length': 128}
+})
+
+@warm(tables=[events_table])
+@profiled
+@validated(validate_body, methods='DELETE, OPTIONS')
 def lambda_handler(event, context):
     event_id = event.get('pathParameters', {}).get('eventId')
-    if 'body' in event:
-        if isinstance(event['body'], str):
-            body = json.loads(event['body'])
-        else:
-            body = event['body']
-    else:
-        body = event
+    body = event['body']
 
     organizer_id = body['organizer_id']
 
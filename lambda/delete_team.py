@@ -1,19 +1,23 @@
 import boto3
 import json
 import os
+from validation import compile_schema, validated
+from profiling import profiled
+from warmup import warm
 
 dynamodb = boto3.resource('dynamodb')
 teams_table = dynamodb.Table(os.environ['TEAMS_TABLE'])
 
+validate_body = compile_schema({
+    'team_captain_id': {'type': 'string', 'required': True, 'max_length': 128}
+})
+
+@warm(tables=[teams_table])
+@profiled
+@validated(validate_body, methods='DELETE, OPTIONS')
 def lambda_handler(event, context):
     team_id = event.get('pathParameters', {}).get('teamId')
-    if 'body' in event:
-        if isinstance(event['body'], str):
-            body = json.loads(event['body'])
-        else:
-            body = event['body']
-    else:
-        body = event
+    body = event['body']
 
     team_captain_id = body['team_captain_id']
 
@@ -1,15 +1,27 @@
 import json
 import os
+from profiling import profiled
+from warmup import warm
+
+# Rendered pages by base URL; the page only depends on the domain and stage
+_rendered = {}
 
-def lambda_handler(event, context):
-    """
-    Lambda function that returns HTML showing all available API endpoints
-    """
 
+def base_url_of(event):
     # Get the base URL from the event context
     domain_name = event.get('requestContext', {}).get('domainName', 'your-api-domain.com')
     stage = event.get('requestContext', {}).get('stage', 'dev')
-    base_url = f"https://{domain_name}/{stage}"
+    return f"https://{domain_name}/{stage}"
+
+
+def preload_dashboard(event):
+    # Warm-up pings carry the API's requestContext (see main.tf)
+    render_dashboard(base_url_of(event))
+
+
+def render_dashboard(base_url):
+    if base_url in _rendered:
+        return _rendered[base_url]
 
     # Define all your endpoints with sample curl commands
     endpoints = [
@@ -43,6 +55,13 @@ def lambda_handler(event, context):
             "content_type": "application/json",
             "curl_sample": f'''curl -X POST {base_url}/event -H "Content-Type: application/json" -d '{{"organizer_id": "user123", "event_name": "Soccer Tournament", "date_start": "2024-06-01", "date_end": "2024-06-03", "location": "Central Park", "additional_info": "Bring your own water bottle"}}' '''
         },
+        {
+            "method": "GET",
+            "path": "/event/{{eventId}}",
+            "description": "Get an event. Optional ?fields=a,b,c returns only the listed attributes; ?include=children,registrations,teams embeds related entities",
+            "content_type": "application/json",
+            "curl_sample": f'''curl -X GET "{base_url}/event/event123?fields=id,name,date_start&include=children,teams" -H "Accept-Encoding: gzip"'''
+        },
         {
             "method": "DELETE", 
             "path": "/event/{{eventId}}",
@@ -50,6 +69,34 @@ def lambda_handler(event, context):
             "content_type": "application/json",
             "curl_sample": f'''curl -X DELETE {base_url}/event/event123 -H "Content-Type: application/json" -d '{{"organizer_id": "user123"}}' '''
         },
+        {
+            "method": "PATCH",
+            "path": "/event/{{eventId}}",
+            "description": "Update only the given fields of an event (only by organizer). Requires If-Match with the ETag from GET; null removes an optional field",
+            "content_type": "application/json",
+            "curl_sample": f'''curl -X PATCH {base_url}/event/event123 -H "Content-Type: application/json" -H 'If-Match: "1"' -d '{{"organizer_id": "user123", "location": "Riverside Park"}}' '''
+        },
+        {
+            "method": "POST",
+            "path": "/event/{{eventId}}/fixtures",
+            "description": "Generate fixtures (round_robin, knockout or groups_knockout) for the event's registered teams (only by organizer)",
+            "content_type": "application/json",
+            "curl_sample": f'''curl -X POST {base_url}/event/event123/fixtures -H "Content-Type: application/json" -d '{{"organizer_id": "user123", "format": "groups_knockout", "venues": ["Field 1", "Field 2"], "group_size": 4, "advance_per_group": 2}}' '''
+        },
+        {
+            "method": "POST",
+            "path": "/event/{{eventId}}/matches/{{matchId}}/result",
+            "description": "Submit or correct a match result and update the standings (only by organizer)",
+            "content_type": "application/json",
+            "curl_sample": f'''curl -X POST {base_url}/event/event123/matches/M000001/result -H "Content-Type: application/json" -d '{{"organizer_id": "user123", "home_score": 2, "away_score": 1}}' '''
+        },
+        {
+            "method": "GET",
+            "path": "/event/{{eventId}}/standings",
+            "description": "Get the sorted standings table of an event. Optional ?group=A",
+            "content_type": "application/json",
+            "curl_sample": f'''curl -X GET {base_url}/event/event123/standings'''
+        },
         # Team Management Endpoints
         {
             "method": "POST", 
@@ -65,10 +112,17 @@ def lambda_handler(event, context):
             "content_type": "application/json",
             "curl_sample": f'''curl -X DELETE {base_url}/team/team123 -H "Content-Type: application/json" -d '{{"team_captain_id": "user123"}}' '''
         },
+        {
+            "method": "PATCH",
+            "path": "/team/{{teamId}}",
+            "description": "Update only the given fields of a team (only by team captain). Requires If-Match with the ETag from GET",
+            "content_type": "application/json",
+            "curl_sample": f'''curl -X PATCH {base_url}/team/team123 -H "Content-Type: application/json" -H 'If-Match: "1"' -d '{{"team_captain_id": "user123", "team_name": "Thunder Bolts"}}' '''
+        },
         {
             "method": "GET", 
             "path": "/user/{{userId}}/teams",
-            "description": "Get all teams for a specific user (team captain)",
+            "description": "Get all teams for a specific user (team captain). Optional ?fields=a,b,c returns only the listed attributes",
             "content_type": "application/json",
             "curl_sample": f'''curl -X GET {base_url}/user/user123/teams'''
         },
@@ -79,6 +133,13 @@ def lambda_handler(event, context):
             "content_type": "application/json",
             "curl_sample": f'''curl -X GET {base_url}/user/user123/organizer/events'''
         },
+        {
+            "method": "GET",
+            "path": "/user/{{userId}}/summary",
+            "description": "Get precomputed counts of events organized and teams captained by a user (also /team/{{teamId}}/summary and /event/{{eventId}}/summary). Counts include finished events that were moved to the archive",
+            "content_type": "application/json",
+            "curl_sample": f'''curl -X GET {base_url}/user/user123/summary'''
+        },
         # Event Registration Endpoints (placeholder)
         {
             "method": "POST", 
@@ -154,6 +215,7 @@ def lambda_handler(event, context):
             .method.get {{ background: #27ae60; color: white; }}
             .method.post {{ background: #3498db; color: white; }}
             .method.put {{ background: #f39c12; color: white; }}
+            .method.patch {{ background: #8e44ad; color: white; }}
             .method.delete {{ background: #e74c3c; color: white; }}
             .path {{
                 font-family: 'Courier New', monospace;
@@ -261,6 +323,17 @@ def lambda_handler(event, context):
 
     # Fill in the template
     html_content = html_template.format(base_url=base_url, endpoints_html=endpoints_html)
+    _rendered[base_url] = html_content
+    return html_content
+
+
+@warm(preload=[preload_dashboard])
+@profiled
+def lambda_handler(event, context):
+    """
+    Lambda function that returns HTML showing all available API endpoints
+    """
+    html_content = render_dashboard(base_url_of(event))
 
     return {
         'statusCode': 200,
@@ -0,0 +1,62 @@
+import re
+
+FIELD_NAME_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+MAX_FIELDS = 32
+
+
+def parse_fields(event):
+    """
+    Parse the `fields` query string parameter (e.g. ?fields=id,name,date_start)
+    into an ordered list of attribute names. Returns None when no fieldset was
+    requested, meaning the full item should be returned.
+    Raises ValueError for malformed field lists.
+    """
+    params = event.get('queryStringParameters') or {}
+    raw = params.get('fields')
+    if raw is None:
+        return None
+
+    fields = []
+    for name in raw.split(','):
+        name = name.strip()
+        if not name:
+            continue
+        if not FIELD_NAME_PATTERN.match(name):
+            raise ValueError(f'Invalid field name: {name}')
+        if name not in fields:
+            fields.append(name)
+
+    if not fields:
+        raise ValueError('fields must name at least one attribute')
+    if len(fields) > MAX_FIELDS:
+        raise ValueError(f'At most {MAX_FIELDS} fields can be requested')
+    return fields
+
+
+def projection_kwargs(fields, required=()):
+    """
+    Build the ProjectionExpression arguments for a get_item/query call so that
+    DynamoDB only reads and returns the requested attributes. Attributes in
+    `required` are always fetched because the handler needs them itself.
+    Attribute names are aliased since many (name, status, ...) are reserved words.
+    """
+    if fields is None:
+        return {}
+
+    names = list(fields)
+    for name in required:
+        if name not in names:
+            names.append(name)
+
+    aliases = {f'#f{i}': name for i, name in enumerate(names)}
+    return {
+        'ProjectionExpression': ', '.join(aliases),
+        'ExpressionAttributeNames': aliases
+    }
+
+
+def select_fields(item, fields):
+    """Drop attributes that were fetched for internal use but not requested"""
+    if fields is None:
+        return item
+    return {key: value for key, value in item.items() if key in fields}
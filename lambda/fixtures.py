@@ -0,0 +1,300 @@
+"""
+Fixture generation for tournaments: round-robin, knockout and groups+knockout.
+
+Teams are referred to by their index in the seeded team list. Every generator
+yields match dicts in playing order:
+
+    {'key': 0, 'stage': 'league', 'round': 1, 'home': 3, 'away': 12}
+
+Knockout matches whose participants are not known yet carry `home_source` /
+`away_source` instead: ('winner', key) for the winner of an earlier match or
+('group', group_index, position) for a group finisher.
+
+schedule() then places matches into (slot, venue) pairs so that no team plays
+in back-to-back slots.
+"""
+import string
+
+STAGE_LEAGUE = 'league'
+STAGE_GROUP = 'group'
+STAGE_KNOCKOUT = 'knockout'
+
+FORMATS = ('round_robin', 'knockout', 'groups_knockout')
+
+
+def round_robin_match_count(team_count):
+    return team_count * (team_count - 1) // 2
+
+
+def knockout_match_count(team_count):
+    return max(team_count - 1, 0)
+
+
+def count_matches(team_count, fixture_format, group_size=4, advance_per_group=2):
+    if fixture_format == 'round_robin':
+        return round_robin_match_count(team_count)
+    if fixture_format == 'knockout':
+        return knockout_match_count(team_count)
+    groups = split_into_groups(team_count, group_size)
+    return (sum(round_robin_match_count(len(group)) for group in groups)
+            + knockout_match_count(len(groups) * min(advance_per_group, group_size)))
+
+
+def round_robin_pairings(team_count):
+    """
+    Circle method. Team 0 stays fixed while the others rotate one position per
+    round, so pairings are computed from array positions without any search.
+    Yields (round, home, away) with rounds numbered from 1.
+    """
+    size = team_count + (team_count % 2)  # odd counts get a bye slot
+    if size < 2:
+        return
+    rotating = size - 1
+    half = size // 2
+    for rnd in range(rotating):
+        # position p holds team 0 for p == 0, otherwise team 1 + (p - 1 + rnd) % rotating
+        for i in range(half):
+            a = 0 if i == 0 else 1 + (i - 1 + rnd) % rotating
+            b = 1 + (size - 2 - i + rnd) % rotating
+            if a >= team_count or b >= team_count:
+                continue  # bye
+            # Teams shift one position per round, so alternating home side by
+            # position parity alternates each team between home and away
+            if (i == 0 and rnd % 2) or (i > 0 and i % 2 == 0):
+                a, b = b, a
+            yield rnd + 1, a, b
+
+
+def bracket_order(size):
+    """Standard seeding order for a power-of-two bracket: 1v16, 8v9, 5v12, ..."""
+    order = [0]
+    while len(order) < size:
+        mirror = 2 * len(order) - 1
+        order = [seed for s in order for seed in (s, mirror - s)]
+    return order
+
+
+def knockout_matches(entrants, first_key=0, first_round=1):
+    """
+    Single-elimination bracket. `entrants` is a seeded list of participants, each
+    either a team index or a source tuple. Top seeds receive byes when the
+    number of entrants is not a power of two.
+    """
+    matches = []
+    if len(entrants) < 2:
+        return matches
+
+    size = 1
+    while size < len(entrants):
+        size *= 2
+
+    # Each bracket position holds ('team', x), ('winner', key) or None for a bye
+    positions = []
+    for seed in bracket_order(size):
+        if seed >= len(entrants):
+            positions.append(None)
+        elif isinstance(entrants[seed], tuple):
+            positions.append(entrants[seed])
+        else:
+            positions.append(('team', entrants[seed]))
+
+    key = first_key
+    rnd = first_round
+    while len(positions) > 1:
+        next_positions = []
+        for i in range(0, len(positions), 2):
+            home, away = positions[i], positions[i + 1]
+            if home is None or away is None:
+                next_positions.append(home or away)
+                continue
+            match = {'key': key, 'stage': STAGE_KNOCKOUT, 'round': rnd}
+            for side, participant in (('home', home), ('away', away)):
+                if participant[0] == 'team':
+                    match[side] = participant[1]
+                else:
+                    match[f'{side}_source'] = participant
+            matches.append(match)
+            next_positions.append(('winner', key))
+            key += 1
+        positions = next_positions
+        rnd += 1
+    return matches
+
+
+def split_into_groups(team_count, group_size):
+    """Snake-seed teams into groups so every group gets a similar spread of seeds"""
+    group_count = max(1, -(-team_count // group_size))
+    groups = [[] for _ in range(group_count)]
+    for team in range(team_count):
+        lap, position = divmod(team, group_count)
+        groups[position if lap % 2 == 0 else group_count - 1 - position].append(team)
+    return groups
+
+
+def group_name(index):
+    letters = string.ascii_uppercase
+    name = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = letters[remainder] + name
+    return name
+
+
+def _avoid_group_rematches(entrants):
+    """
+    Swap seeds of equal group position so that no first knockout round pairs
+    two teams from the same group
+    """
+    entrants = list(entrants)
+    size = 1
+    while size < len(entrants):
+        size *= 2
+
+    # Walk the bracket to find each seed's first real opponent (byes skip rounds)
+    opponent = {}
+    positions = [seed if seed < len(entrants) else None for seed in bracket_order(size)]
+    while len(positions) > 1:
+        next_positions = []
+        for i in range(0, len(positions), 2):
+            home, away = positions[i], positions[i + 1]
+            if home is None or away is None:
+                next_positions.append(away if home is None else home)
+                continue
+            if isinstance(home, int) and isinstance(away, int):
+                opponent[home], opponent[away] = away, home
+            next_positions.append('winner')
+        positions = next_positions
+
+    def clashes(seed):
+        other = opponent.get(seed)
+        return other is not None and entrants[seed][1] == entrants[other][1]
+
+    for seed in range(len(entrants)):
+        if not clashes(seed):
+            continue
+        for candidate in range(len(entrants) - 1, -1, -1):
+            if candidate == seed or entrants[candidate][2] != entrants[seed][2]:
+                continue
+            entrants[seed], entrants[candidate] = entrants[candidate], entrants[seed]
+            if clashes(seed) or clashes(candidate):
+                entrants[seed], entrants[candidate] = entrants[candidate], entrants[seed]
+            else:
+                break
+    return entrants
+
+
+def generate(team_count, fixture_format, group_size=4, advance_per_group=2):
+    """Yield the matches for `team_count` seeded teams in the given format"""
+    if fixture_format == 'round_robin':
+        for key, (rnd, home, away) in enumerate(round_robin_pairings(team_count)):
+            yield {'key': key, 'stage': STAGE_LEAGUE, 'round': rnd, 'home': home, 'away': away}
+
+    elif fixture_format == 'knockout':
+        yield from knockout_matches(list(range(team_count)))
+
+    elif fixture_format == 'groups_knockout':
+        groups = split_into_groups(team_count, group_size)
+        key = 0
+        last_round = 0
+        group_fixtures = [list(round_robin_pairings(len(group))) for group in groups]
+        # Interleave groups round by round so all groups progress together
+        cursors = [0] * len(groups)
+        rnd = 1
+        while any(cursor < len(fixtures) for cursor, fixtures in zip(cursors, group_fixtures)):
+            for g, fixtures in enumerate(group_fixtures):
+                while cursors[g] < len(fixtures) and fixtures[cursors[g]][0] == rnd:
+                    _, home, away = fixtures[cursors[g]]
+                    yield {
+                        'key': key, 'stage': STAGE_GROUP, 'round': rnd, 'group': group_name(g),
+                        'home': groups[g][home], 'away': groups[g][away]
+                    }
+                    key += 1
+                    cursors[g] += 1
+            last_round = rnd
+            rnd += 1
+
+        # Group winners are seeded first, then runners-up, and so on
+        advancing = min(advance_per_group, group_size)
+        entrants = [('group', g, position)
+                    for position in range(1, advancing + 1)
+                    for g in range(len(groups))
+                    if position <= len(groups[g])]
+        yield from knockout_matches(_avoid_group_rematches(entrants), first_key=key, first_round=last_round + 1)
+
+    else:
+        raise ValueError(f"Unknown fixture format: {fixture_format}")
+
+
+def schedule(matches, venue_count, slot_count=None, min_rest_slots=1):
+    """
+    Greedily place matches into the earliest (slot, venue) pair such that each
+    team rests at least `min_rest_slots` slots between games. Knockout matches
+    wait for their source matches, and matches fed by group positions wait for
+    the whole group stage. Free slots are found with a union-find "next free
+    slot" array, so placement stays near-linear in the number of matches.
+
+    Sets 'slot' and 'venue' (indexes) on each match and returns the matches.
+    Raises ValueError when `slot_count` slots are not enough.
+    """
+    if venue_count < 1:
+        raise ValueError('At least one venue is required')
+
+    gap = 1 + min_rest_slots
+    used = []        # matches already placed in each slot
+    next_free = []   # union-find parent: next slot that may have a free venue
+    team_last = {}   # team index -> last slot played
+    match_slot = {}  # match key -> slot
+    group_stage_end = -1
+
+    def ensure(slot):
+        while len(next_free) <= slot:
+            next_free.append(len(next_free))
+            used.append(0)
+
+    def find(slot):
+        ensure(slot)
+        root = slot
+        while next_free[root] != root:
+            root = next_free[root]
+            ensure(root)
+        while next_free[slot] != root:
+            next_free[slot], slot = root, next_free[slot]
+        return root
+
+    placed = []
+    for match in matches:
+        home = match.get('home')
+        away = match.get('away')
+        earliest = 0
+        if home in team_last:
+            earliest = team_last[home] + gap
+        if away in team_last:
+            earliest = max(earliest, team_last[away] + gap)
+        for source in (match.get('home_source'), match.get('away_source')):
+            if source is None:
+                continue
+            if source[0] == 'winner':
+                earliest = max(earliest, match_slot[source[1]] + gap)
+            else:
+                earliest = max(earliest, group_stage_end + gap)
+
+        slot = find(earliest)
+        if slot_count is not None and slot >= slot_count:
+            raise ValueError(f'{slot_count} slots x {venue_count} venues is not enough to schedule every match')
+
+        match['slot'] = slot
+        match['venue'] = used[slot]
+        used[slot] += 1
+        if used[slot] == venue_count:
+            next_free[slot] = slot + 1
+        if match['stage'] == STAGE_KNOCKOUT:
+            match_slot[match['key']] = slot
+        elif match['stage'] == STAGE_GROUP:
+            group_stage_end = max(group_stage_end, slot)
+        if home is not None:
+            team_last[home] = slot
+        if away is not None:
+            team_last[away] = slot
+        placed.append(match)
+    return placed
@@ -0,0 +1,208 @@
+import boto3
+import json
+import os
+from boto3.dynamodb.conditions import Key
+import fixtures
+import standings
+from batch_fetch import query_all
+from validation import compile_schema, validated
+from profiling import profiled
+from warmup import warm
+
+dynamodb = boto3.resource('dynamodb')
+events_table = dynamodb.Table(os.environ['EVENTS_TABLE'])
+registrations_table = dynamodb.Table(os.environ['EVENT_REGISTRATIONS_TABLE'])
+matches_table = dynamodb.Table(os.environ['MATCHES_TABLE'])
+standings_table = dynamodb.Table(os.environ['STANDINGS_TABLE'])
+
+# Bounded by what one invocation can write within the Lambda timeout
+MAX_MATCHES = int(os.environ.get('MAX_FIXTURE_MATCHES', 20000))
+
+validate_body = compile_schema({
+    'organizer_id': {'type': 'string', 'required': True, 'max_length': 128},
+    'format': {'type': 'string', 'enum': fixtures.FORMATS, 'default': 'round_robin'},
+    'venues': {'type': 'list', 'min_length': 1, 'max_length': 1000, 'default': ['Main Field'], 'items': {'type': 'string', 'min_length': 1, 'max_length': 200}},
+    'slots': {'type': 'list', 'max_length': MAX_MATCHES, 'items': {'type': 'date'}},
+    # submit_result checks every match of a group in one transaction (at most 100 items)
+    'group_size': {'type': 'integer', 'minimum': 2, 'maximum': 12, 'default': 4},
+    'advance_per_group': {'type': 'integer', 'minimum': 1, 'default': 2},
+    'min_rest_slots': {'type': 'integer', 'minimum': 0, 'default': 1},
+    'replace': {'type': 'boolean'}
+})
+
+
+def error_response(status_code, message):
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'POST, OPTIONS',
+            'Access-Control-Allow-Headers': 'Content-Type'
+        },
+        'body': json.dumps({'error': message})
+    }
+
+
+def build_match_items(event_id, matches, teams, venues, slots):
+    """Turn scheduled engine matches into matches-table items ordered by slot and venue"""
+    matches = sorted(matches, key=lambda m: (m['slot'], m['venue']))
+    match_ids = {match['key']: f"M{number:06d}" for number, match in enumerate(matches, start=1)}
+
+    items = []
+    for match in matches:
+        item = {
+            'event_id': event_id,
+            'match_id': match_ids[match['key']],
+            'stage': match['stage'],
+            'round': match['round'],
+            'slot': match['slot'],
+            'venue': venues[match['venue']],
+            'status': 'scheduled'
+        }
+        if slots:
+            item['start_time'] = slots[match['slot']]
+        if 'group' in match:
+            item['group'] = match['group']
+        for side in ('home', 'away'):
+            if match.get(side) is not None:
+                team = teams[match[side]]
+                item[f'{side}_team_id'] = team['team_id']
+                if team.get('team_name'):
+                    item[f'{side}_team_name'] = team['team_name']
+            source = match.get(f'{side}_source')
+            if source and source[0] == 'winner':
+                item[f'{side}_source'] = f"winner:{match_ids[source[1]]}"
+            elif source:
+                item[f'{side}_source'] = f"group:{fixtures.group_name(source[1])}:{source[2]}"
+        items.append(item)
+
+    # Let a result reach the matches it decides by key instead of reading the whole event:
+    # `feeds` lists the matches taking a team from it, `group_match_ids` the whole group
+    fed_by = {}
+    group_match_ids = {}
+    for item in items:
+        for side in ('home', 'away'):
+            kind, _, origin = item.get(f'{side}_source', '').partition(':')
+            if kind:
+                feeding = fed_by.setdefault(origin if kind == 'winner' else origin.split(':')[0], [])
+                if item['match_id'] not in feeding:
+                    feeding.append(item['match_id'])
+        if item['stage'] == fixtures.STAGE_GROUP:
+            group_match_ids.setdefault(item['group'], []).append(item['match_id'])
+    for item in items:
+        if item['stage'] == fixtures.STAGE_GROUP:
+            item['group_match_ids'] = group_match_ids[item['group']]
+            item['feeds'] = fed_by.get(item['group'], [])
+        elif item['stage'] == fixtures.STAGE_KNOCKOUT:
+            item['feeds'] = fed_by.get(item['match_id'], [])
+    return items
+
+
+@warm(tables=[events_table, registrations_table, matches_table, standings_table])
+@profiled
+@validated(validate_body)
+def lambda_handler(event, context):
+    """
+    Generate the fixture list for an event from its registered teams.
+    Expected path parameters: eventId
+    Body: organizer_id, format (round_robin | knockout | groups_knockout),
+          venues, optional slots (start times), group_size, advance_per_group,
+          min_rest_slots, replace
+    """
+    event_id = event.get('pathParameters', {}).get('eventId')
+    body = event['body']
+
+    organizer_id = body.get('organizer_id')
+    fixture_format = body['format']
+    venues = body['venues']
+    slots = body.get('slots')
+    group_size = body['group_size']
+    advance_per_group = body['advance_per_group']
+    min_rest_slots = body['min_rest_slots']
+
+    if not event_id:
+        return error_response(400, 'event_id is required')
+
+    try:
+        get_response = events_table.get_item(Key={'id': event_id})
+        if 'Item' not in get_response:
+            return error_response(404, 'Event not found')
+        if get_response['Item']['organizer_id'] != organizer_id:
+            return error_response(403, 'Unauthorized: Only event organizer can generate fixtures')
+
+        # Registration order is the seeding unless an explicit seed is stored
+        teams = query_all(registrations_table, KeyConditionExpression=Key('event_id').eq(event_id))
+        teams.sort(key=lambda team: (int(team.get('seed', 1 << 30)), team.get('team_name', ''), team['team_id']))
+        if len(teams) < 2:
+            return error_response(400, 'At least two registered teams are required')
+
+        match_count = fixtures.count_matches(len(teams), fixture_format, group_size, advance_per_group)
+        if match_count > MAX_MATCHES:
+            return error_response(400, f'{match_count} matches exceeds the limit of {MAX_MATCHES}; split the event into divisions')
+
+        existing = query_all(
+            matches_table,
+            KeyConditionExpression=Key('event_id').eq(event_id),
+            ProjectionExpression='event_id, match_id'
+        )
+        if existing and not body.get('replace'):
+            return error_response(409, 'Fixtures already exist for this event; pass "replace": true to regenerate')
+
+        try:
+            scheduled = fixtures.schedule(
+                fixtures.generate(len(teams), fixture_format, group_size, advance_per_group),
+                venue_count=len(venues),
+                slot_count=len(slots) if slots else None,
+                min_rest_slots=min_rest_slots
+            )
+        except ValueError as e:
+            return error_response(400, str(e))
+
+        items = build_match_items(event_id, scheduled, teams, venues, slots)
+
+        # batch_writer groups puts/deletes into 25-item BatchWriteItem calls and retries unprocessed items
+        with matches_table.batch_writer(overwrite_by_pkeys=['event_id', 'match_id']) as batch:
+            new_ids = {item['match_id'] for item in items}
+            for old in existing:
+                if old['match_id'] not in new_ids:
+                    batch.delete_item(Key={'event_id': event_id, 'match_id': old['match_id']})
+            for item in items:
+                batch.put_item(Item=item)
+
+        # Start every league/group team on an empty standings row so the table lists teams before they play
+        rows = standings.compute_table(items)
+        old_rows = query_all(
+            standings_table,
+            KeyConditionExpression=Key('event_id').eq(event_id),
+            ProjectionExpression='event_id, team_id'
+        )
+        with standings_table.batch_writer(overwrite_by_pkeys=['event_id', 'team_id']) as batch:
+            for old in old_rows:
+                if old['team_id'] not in rows:
+                    batch.delete_item(Key={'event_id': event_id, 'team_id': old['team_id']})
+            for row in rows.values():
+                batch.put_item(Item={'event_id': event_id, **row})
+
+        return {
+            'statusCode': 201,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*'
+            },
+            'body': json.dumps({
+                'result': 'success',
+                'event_id': event_id,
+                'format': fixture_format,
+                'team_count': len(teams),
+                'match_count': len(items),
+                'slot_count': max(item['slot'] for item in items) + 1 if items else 0
+            })
+        }
+
+    except Exception as e:
+        print(f"Error generating fixtures: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': str(e)})
+        }
@@ -1,10 +1,136 @@
 import boto3
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from boto3.dynamodb.conditions import Key
+import archive
+import versioning
+from batch_fetch import batch_get_items, query_all
+from compression import compress_response
+from fieldsets import parse_fields, projection_kwargs, select_fields
+from profiling import profiled
+from warmup import warm
 
 dynamodb = boto3.resource('dynamodb')
 events_table = dynamodb.Table(os.environ['EVENTS_TABLE'])
+# Related entities are fetched from worker threads, which must share the thread-safe client
+client = dynamodb.meta.client
+REGISTRATIONS_TABLE = os.environ['EVENT_REGISTRATIONS_TABLE']
+TEAMS_TABLE = os.environ['TEAMS_TABLE']
+USER_TABLE = os.environ['USER_TABLE']
+archive_index_table = dynamodb.Table(os.environ['ARCHIVE_INDEX_TABLE'])
+s3 = boto3.client('s3')
+ARCHIVE_BUCKET = os.environ['ARCHIVE_BUCKET']
 
+INCLUDE_OPTIONS = ('children', 'registrations', 'teams')
+MAX_INCLUDED_TEAMS = 1000
+MAX_INCLUDED_MEMBERS = 5000
+# Only what get_team shows of a member; user items also hold the password hash
+MEMBER_PROJECTION = {'ProjectionExpression': 'user_id, first_name, last_name'}
+# Lambda proxy responses are capped at 6 MB
+MAX_RESPONSE_BYTES = int(os.environ.get('MAX_RESPONSE_BYTES', 5 * 1024 * 1024))
+
+
+def parse_include(event):
+    params = event.get('queryStringParameters') or {}
+    raw = params.get('include')
+    if not raw:
+        return set()
+    include = {name.strip() for name in raw.split(',') if name.strip()}
+    unknown = include - set(INCLUDE_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown include: {', '.join(sorted(unknown))}. Allowed: {', '.join(INCLUDE_OPTIONS)}")
+    return include
+
+
+def fetch_related(event_id, include, fields):
+    """
+    Resolve ?include= relationships in one pass: child events, registrations of
+    the event (and of its children when both are included) and the registered
+    teams with their members, each deduplicated across the whole response
+    """
+    related = {}
+    event_ids = [event_id]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        if 'children' in include:
+            children = query_all(
+                client,
+                TableName=events_table.name,
+                IndexName='parent_event_id-index',
+                KeyConditionExpression=Key('parent_event_id').eq(event_id),
+                **projection_kwargs(fields, required=['id'])
+            )
+            related['children'] = [select_fields(child, fields) for child in children]
+            event_ids += [child['id'] for child in children]
+
+        registrations = []
+        if 'registrations' in include or 'teams' in include:
+            queries = executor.map(
+                lambda registered_event_id: query_all(
+                    client,
+                    TableName=REGISTRATIONS_TABLE,
+                    KeyConditionExpression=Key('event_id').eq(registered_event_id)
+                ),
+                event_ids
+            )
+            registrations = [registration for items in queries for registration in items]
+            if 'registrations' in include:
+                related['registrations'] = registrations
+
+    if 'teams' in include:
+        related['teams'] = fetch_teams(registrations)
+    return related
+
+
+def fetch_teams(registrations):
+    team_keys = [{'id': registration['team_id']} for registration in registrations]
+    if len({key['id'] for key in team_keys}) > MAX_INCLUDED_TEAMS:
+        raise OverflowError(f'More than {MAX_INCLUDED_TEAMS} registered teams; fetch teams separately')
+    teams = batch_get_items(client, TEAMS_TABLE, team_keys)
+
+    # Users on several teams are fetched once
+    member_ids = {member_id for team in teams for member_id in team.get('members', [])}
+    if len(member_ids) > MAX_INCLUDED_MEMBERS:
+        raise OverflowError(f'More than {MAX_INCLUDED_MEMBERS} members across registered teams; fetch teams separately')
+    users = {
+        user['user_id']: user
+        for user in batch_get_items(client, USER_TABLE, [{'user_id': user_id} for user_id in member_ids], MEMBER_PROJECTION)
+    }
+    for team in teams:
+        # Same shape as get_team; users deleted since joining are left out
+        team['members'] = [
+            {'id': member_id, 'name': f"{users[member_id].get('first_name', '')} {users[member_id].get('last_name', '')}"}
+            for member_id in team.get('members', []) if member_id in users
+        ]
+    return teams
+
+
+def fetch_archived_related(index_entry, include, fields):
+    """Same as fetch_related, served from the event's archive object (teams are never archived)"""
+    data = s3.get_object(Bucket=ARCHIVE_BUCKET, Key=index_entry['s3_key'])['Body'].read()
+    records = archive.decode(data)
+    event_id = index_entry['event_id']
+
+    related = {}
+    event_ids = {event_id}
+    if 'children' in include:
+        children = [r['item'] for r in records
+                    if r['type'] == archive.RECORD_EVENT and r['item'].get('parent_event_id') == event_id]
+        related['children'] = [select_fields(child, fields) for child in children]
+        event_ids.update(child['id'] for child in children)
+
+    registrations = [r['item'] for r in records
+                     if r['type'] == archive.RECORD_REGISTRATION and r['item']['event_id'] in event_ids]
+    if 'registrations' in include:
+        related['registrations'] = registrations
+    if 'teams' in include:
+        related['teams'] = fetch_teams(registrations)
+    return related
+
+
+@warm(tables=[events_table, archive_index_table])
+@profiled
 def lambda_handler(event, context):
     event_id = event.get('pathParameters', {}).get('eventId')
     if not event_id:
@@ -21,19 +147,66 @@ def lambda_handler(event, context):
             })
         }
 
-    # First, verify that the requesting user is the team captain
     try:
-        response = events_table.get_item(Key={'id': event_id})
-        if 'Item' not in response:
+        fields = parse_fields(event)
+        include = parse_include(event)
+    except ValueError as e:
+        return {
+            'statusCode': 400,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type'
+            },
+            'body': json.dumps({
+                    'error': str(e)
+            })
+        }
+
+    try:
+        # Only read the requested attributes; 'id' keeps projected lookups distinguishable from misses
+        response = events_table.get_item(
+            Key={'id': event_id},
+            **projection_kwargs(fields, required=['id', versioning.VERSION_ATTRIBUTE])
+        )
+        headers = {}
+        if 'Item' in response:
+            result = {'event': select_fields(response['Item'], fields)}
+            headers['ETag'] = versioning.etag(response['Item'])
+            load_related = lambda: fetch_related(event_id, include, fields)
+        else:
+            # Finished events are moved out of the hot table by archive_events
+            index_entry = archive_index_table.get_item(Key={'event_id': event_id}).get('Item')
+            if index_entry is None:
+                return {
+                    'statusCode': 404,
+                    'body': json.dumps({'error': 'Event not found'})
+                }
+            result = {'event': select_fields(json.loads(index_entry['event']), fields), 'archived': True}
+            load_related = lambda: fetch_archived_related(index_entry, include, fields)
+
+        if include:
+            try:
+                result.update(load_related())
+            except OverflowError as e:
+                return {
+                    'statusCode': 413,
+                    'body': json.dumps({'error': str(e)})
+                }
+
+        body = json.dumps(result, default=str)
+        if len(body) > MAX_RESPONSE_BYTES:
             return {
-                'statusCode': 404,
-                'body': json.dumps({'error': 'Event not found'})
+                'statusCode': 413,
+                'body': json.dumps({'error': 'Response too large; request fewer includes or use ?fields='})
             }
 
-        return {
+        return compress_response(event, {
             'statusCode': 200,
-            'body': json.dumps({'event': response['Item']})
-        }
+            'headers': headers,
+            'body': body
+        })
 
     except Exception as e:
         return {
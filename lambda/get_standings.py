@@ -0,0 +1,68 @@
+import boto3
+import json
+import os
+from boto3.dynamodb.conditions import Key
+from compression import compress_response
+import standings
+from profiling import profiled
+from warmup import warm
+
+dynamodb = boto3.resource('dynamodb')
+standings_table = dynamodb.Table(os.environ['STANDINGS_TABLE'])
+
+@warm(tables=[standings_table])
+@profiled
+def lambda_handler(event, context):
+    """
+    Lambda function to get the sorted standings table of an event
+    Expected path parameters: eventId
+    Optional query parameters: group
+    """
+    event_id = event.get('pathParameters', {}).get('eventId')
+    if not event_id:
+        return {
+            'statusCode': 400,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type'
+            },
+            'body': json.dumps({
+                    'error': 'event_id is required'
+            })
+        }
+    group = (event.get('queryStringParameters') or {}).get('group')
+
+    try:
+        # Rows are maintained incrementally by submit_result, so this is a single query
+        query_kwargs = {'KeyConditionExpression': Key('event_id').eq(event_id)}
+        rows = []
+        while True:
+            response = standings_table.query(**query_kwargs)
+            rows.extend(response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        if group:
+            rows = [row for row in rows if row.get('group') == group]
+
+        return compress_response(event, {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*'
+            },
+            'body': json.dumps({
+                'event_id': event_id,
+                'standings': standings.sort_table(rows)
+            })
+        })
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': str(e)})
+        }
@@ -0,0 +1,66 @@
+import boto3
+import json
+import os
+from profiling import profiled
+from warmup import warm
+
+dynamodb = boto3.resource('dynamodb')
+summaries_table = dynamodb.Table(os.environ['SUMMARIES_TABLE'])
+
+# Path parameter -> summary key prefix and the counters it carries
+SUMMARY_KINDS = {
+    'userId': ('user', ('events', 'teams')),
+    'teamId': ('team', ('sub_teams',)),
+    'eventId': ('event', ('child_events', 'registrations'))
+}
+
+@warm(tables=[summaries_table])
+@profiled
+def lambda_handler(event, context):
+    """
+    Lambda function to read the precomputed counters maintained by stream_counters
+    Routes: GET /user/{userId}/summary, GET /team/{teamId}/summary, GET /event/{eventId}/summary
+    """
+    path_parameters = event.get('pathParameters') or {}
+    for parameter, (prefix, counters) in SUMMARY_KINDS.items():
+        if path_parameters.get(parameter):
+            entity_id = path_parameters[parameter]
+            break
+    else:
+        return {
+            'statusCode': 400,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type'
+            },
+            'body': json.dumps({
+                    'error': 'userId, teamId or eventId is required'
+            })
+        }
+
+    try:
+        response = summaries_table.get_item(Key={'summary_id': f"{prefix}#{entity_id}"})
+        item = response.get('Item', {})
+
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*'
+            },
+            'body': json.dumps({
+                'id': entity_id,
+                'type': prefix,
+                # Entities nothing has been counted for yet simply have zero counts
+                'counts': {counter: int(item.get(counter, 0)) for counter in counters}
+            })
+        }
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': str(e)})
+        }
@@ -1,9 +1,16 @@
 import boto3
 import json
 import os
+from profiling import profiled
+from warmup import warm
 
 dynamodb = boto3.client('dynamodb')
 
+def describe_teams_table(event):
+    dynamodb.describe_table(TableName=os.environ['TEAMS_TABLE'])
+
+@warm(preload=[describe_teams_table])
+@profiled
 def lambda_handler(event, context):
     team_id = event.get('pathParameters', {}).get('teamId')
     if not team_id:
@@ -52,6 +59,7 @@ def lambda_handler(event, context):
 
         return {
             'statusCode': 200,
+            'headers': {'ETag': f'"{team.get("version", {}).get("N", "0")}"'},
             'body': json.dumps({
                 'team': {
                     'id': team['id']['S'],
@@ -1,14 +1,21 @@
 import boto3
 import json
 import os
+from compression import compress_response
+from fieldsets import parse_fields, projection_kwargs, select_fields
+from profiling import profiled
+from warmup import warm
 
 dynamodb = boto3.resource('dynamodb')
 teams_table = dynamodb.Table(os.environ['TEAMS_TABLE'])
 
+@warm(tables=[teams_table])
+@profiled
 def lambda_handler(event, context):
     """
     Lambda function to get all teams for a specific user (team captain)
     Expected path parameters: userId
+    Optional query parameters: fields (comma-separated attributes to return per team)
     """
 
     try:
@@ -25,13 +32,27 @@ def lambda_handler(event, context):
                 'body': json.dumps({'error': 'userId path parameter is required'})
             }
 
-        # Query DynamoDB using the team_captain_id-index
+        try:
+            fields = parse_fields(event)
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({'error': str(e)})
+            }
+
+        # Query DynamoDB using the team_captain_id-index.
+        # id and parent_team_id are always fetched to assemble subTeams.
         response = teams_table.query(
             IndexName='team_captain_id-index',
             KeyConditionExpression='team_captain_id = :captain_id',
             ExpressionAttributeValues={
                 ':captain_id': user_id
-            }
+            },
+            **projection_kwargs(fields, required=['id', 'parent_team_id'])
         )
 
         all_teams = response.get('Items', [])
@@ -41,10 +62,12 @@ def lambda_handler(event, context):
             if team.get('parent_team_id'):
                 sub_teams[team['parent_team_id']] = [*sub_teams.get(team['parent_team_id'], []), team['id']]
         for team in teams:
-            if sub_teams.get(team['id']):
+            if sub_teams.get(team['id']) and (fields is None or 'subTeams' in fields):
                 team['subTeams'] = sub_teams[team['id']]
+        if fields is not None:
+            teams = [select_fields(team, fields + ['subTeams']) for team in teams]
 
-        return {
+        return compress_response(event, {
             'statusCode': 200,
             'headers': {
                 'Content-Type': 'application/json',
@@ -55,7 +78,7 @@ def lambda_handler(event, context):
                 'count': len(teams),
                 'team_captain_id': user_id
             }, default=str)  # Use default=str to handle any special types
-        }
+        })
 
     except Exception as e:
         print(f"Error: {str(e)}")  # This will appear in CloudWatch logs
@@ -0,0 +1,211 @@
+import boto3
+import copy
+import functools
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+
+dynamodb = boto3.resource('dynamodb')
+idempotency_table = dynamodb.Table(os.environ['IDEMPOTENCY_TABLE'])
+
+IDEMPOTENCY_HEADER = 'idempotency-key'
+MAX_KEY_LENGTH = 255
+# How long a completed response is replayed for
+RECORD_TTL_SECONDS = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', 24 * 60 * 60))
+# A claim older than this is assumed to belong to a crashed invocation (Lambda timeout is 30s)
+IN_PROGRESS_TTL_SECONDS = 60
+LOCAL_CACHE_SIZE = 1024
+
+STATUS_IN_PROGRESS = 'IN_PROGRESS'
+STATUS_COMPLETED = 'COMPLETED'
+
+# Per-container cache of completed responses so hot retries never reach DynamoDB
+_local_cache = OrderedDict()
+
+
+def get_idempotency_key(event):
+    """Return the Idempotency-Key header of an API Gateway event, or None"""
+    headers = event.get('headers') or {}
+    for name, value in headers.items():
+        if name.lower() == IDEMPOTENCY_HEADER:
+            return value or None
+    return None
+
+
+def _request_hash(event):
+    body = event.get('body', '')
+    if not isinstance(body, str):
+        body = json.dumps(body, sort_keys=True, default=str)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def _error_response(status_code, message):
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'POST, OPTIONS',
+            'Access-Control-Allow-Headers': 'Content-Type, Idempotency-Key'
+        },
+        'body': json.dumps({'error': message})
+    }
+
+
+def _replay(response):
+    replayed = copy.deepcopy(response)
+    replayed['headers'] = {**replayed.get('headers', {}), 'Idempotent-Replayed': 'true'}
+    return replayed
+
+
+def _cache_get(record_key, now):
+    entry = _local_cache.get(record_key)
+    if entry is None:
+        return None
+    if entry['expires_at'] <= now:
+        del _local_cache[record_key]
+        return None
+    _local_cache.move_to_end(record_key)
+    return entry
+
+
+def _cache_put(record_key, request_hash, response, expires_at):
+    _local_cache[record_key] = {
+        'request_hash': request_hash,
+        'response': response,
+        'expires_at': expires_at
+    }
+    _local_cache.move_to_end(record_key)
+    while len(_local_cache) > LOCAL_CACHE_SIZE:
+        _local_cache.popitem(last=False)
+
+
+def _claim(record_key, request_hash, now):
+    """Conditionally create an in-progress record. Returns False if one already exists"""
+    try:
+        idempotency_table.put_item(
+            Item={
+                'idempotency_key': record_key,
+                'status': STATUS_IN_PROGRESS,
+                'request_hash': request_hash,
+                'expires_at': now + IN_PROGRESS_TTL_SECONDS
+            },
+            # TTL deletion lags behind expiry, so expired records count as absent
+            ConditionExpression='attribute_not_exists(idempotency_key) OR expires_at < :now',
+            ExpressionAttributeValues={':now': now}
+        )
+        return True
+    except idempotency_table.meta.client.exceptions.ConditionalCheckFailedException:
+        return False
+
+
+def _complete(record_key, request_hash, response):
+    expires_at = int(time.time()) + RECORD_TTL_SECONDS
+    idempotency_table.put_item(
+        Item={
+            'idempotency_key': record_key,
+            'status': STATUS_COMPLETED,
+            'request_hash': request_hash,
+            'response': json.dumps(response),
+            'expires_at': expires_at
+        }
+    )
+    _cache_put(record_key, request_hash, response, expires_at)
+
+
+def _release(record_key):
+    try:
+        idempotency_table.delete_item(
+            Key={'idempotency_key': record_key},
+            ConditionExpression='#status = :in_progress',
+            ExpressionAttributeNames={'#status': 'status'},
+            ExpressionAttributeValues={':in_progress': STATUS_IN_PROGRESS}
+        )
+    except Exception as e:
+        print(f"Error releasing idempotency key {record_key}: {str(e)}")
+
+
+def stored_response(scope, event):
+    """
+    Replay of the completed response stored for the request's Idempotency-Key,
+    or None. Lets a layer that turns requests away before @idempotent runs (the
+    rate limiter) still answer a retry of a request that already succeeded.
+    """
+    key = get_idempotency_key(event)
+    if key is None or len(key) > MAX_KEY_LENGTH:
+        return None
+    record_key = f"{scope}#{key}"
+    now = int(time.time())
+
+    cached = _cache_get(record_key, now)
+    if cached is None:
+        record = idempotency_table.get_item(Key={'idempotency_key': record_key}).get('Item')
+        if record is None or record['status'] != STATUS_COMPLETED or int(record['expires_at']) <= now:
+            return None
+        cached = {'request_hash': record['request_hash'], 'response': json.loads(record['response'])}
+        _cache_put(record_key, record['request_hash'], cached['response'], int(record['expires_at']))
+    if cached['request_hash'] != _request_hash(event):
+        return None
+    return _replay(cached['response'])
+
+
+def idempotent(scope):
+    """
+    Decorator for create handlers. Requests carrying an Idempotency-Key header are
+    executed at most once per key within RECORD_TTL_SECONDS; retries get the stored
+    response back. Only 2xx responses are stored, so failed requests can be retried.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            key = get_idempotency_key(event)
+            if key is None:
+                return handler(event, context)
+            if len(key) > MAX_KEY_LENGTH:
+                return _error_response(400, f'Idempotency-Key must be at most {MAX_KEY_LENGTH} characters')
+
+            record_key = f"{scope}#{key}"
+            request_hash = _request_hash(event)
+            now = int(time.time())
+
+            cached = _cache_get(record_key, now)
+            if cached:
+                if cached['request_hash'] != request_hash:
+                    return _error_response(422, 'Idempotency-Key was already used with a different request body')
+                return _replay(cached['response'])
+
+            if not _claim(record_key, request_hash, now):
+                record = idempotency_table.get_item(
+                    Key={'idempotency_key': record_key},
+                    ConsistentRead=True
+                ).get('Item')
+                if record is None:
+                    # Released between our claim and read; let the client retry
+                    return _error_response(409, 'A request with this Idempotency-Key is already in progress')
+                if record['request_hash'] != request_hash:
+                    return _error_response(422, 'Idempotency-Key was already used with a different request body')
+                if record['status'] != STATUS_COMPLETED:
+                    return _error_response(409, 'A request with this Idempotency-Key is already in progress')
+                response = json.loads(record['response'])
+                _cache_put(record_key, request_hash, response, int(record['expires_at']))
+                return _replay(response)
+
+            try:
+                response = handler(event, context)
+            except Exception:
+                _release(record_key)
+                raise
+
+            if 200 <= response.get('statusCode', 500) < 300:
+                try:
+                    _complete(record_key, request_hash, response)
+                except Exception as e:
+                    # The write already happened; a failed store only costs the replay
+                    print(f"Error storing idempotent response for {record_key}: {str(e)}")
+            else:
+                _release(record_key)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,194 @@
+"""
+On-demand profiling of single requests.
+
+Handlers wrapped in @profiled are profiled when the request carries a valid
+X-Profile header, or at random for a PROFILE_SAMPLE_RATE share of requests.
+Neither is configured by default, in which case @profiled returns the handler
+unchanged and costs nothing.
+
+The header is `<expires>.<signature>`: a unix timestamp and the hex
+HMAC-SHA256 of it under PROFILE_SECRET. Create one with
+
+    python -c "import profiling; print(profiling.profile_token('<secret>', 300))"
+
+A profiled request logs one JSON line holding:
+- `folded`: stacks sampled every PROFILE_INTERVAL_MS, in the folded format
+  flamegraph.pl and speedscope read (`jq -r '.folded[]'`), most common first
+  and cut at MAX_FOLDED_BYTES; `dropped_stacks` counts the rarer ones left out
+- `aws_calls`: every AWS call made during the request with its duration
+
+Sampling keeps the overhead on the profiled request low and its timings
+realistic, which a tracing profiler like cProfile would not.
+"""
+import collections
+import functools
+import hashlib
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+PROFILE_HEADER = 'x-profile'
+PROFILE_SECRET = os.environ.get('PROFILE_SECRET', '')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+PROFILE_INTERVAL_SECONDS = float(os.environ.get('PROFILE_INTERVAL_MS', 5)) / 1000
+# Tokens must expire; this bounds how far ahead they may be minted
+MAX_TOKEN_TTL_SECONDS = 24 * 60 * 60
+# CloudWatch Logs events are capped at 256 KB; leave room for the rest of the line
+MAX_FOLDED_BYTES = 200 * 1024
+
+
+def profile_token(secret, ttl_seconds):
+    expires = int(time.time()) + ttl_seconds
+    signature = hmac.new(secret.encode(), str(expires).encode(), hashlib.sha256).hexdigest()
+    return f"{expires}.{signature}"
+
+
+def valid_token(token, secret=None, now=None):
+    secret = PROFILE_SECRET if secret is None else secret
+    now = time.time() if now is None else now
+    expires, _, signature = token.partition('.')
+    if not secret or not expires.isdigit() or not now < int(expires) <= now + MAX_TOKEN_TTL_SECONDS:
+        return False
+    expected = hmac.new(secret.encode(), expires.encode(), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(signature, expected)
+
+
+def _requested(event):
+    headers = event.get('headers') if isinstance(event, dict) else None
+    if not headers:
+        return False
+    for name, value in headers.items():
+        if name.lower() == PROFILE_HEADER:
+            return valid_token(value or '')
+    return False
+
+
+class StackSampler(threading.Thread):
+    """Counts the folded stacks of every other thread every `interval` seconds"""
+
+    def __init__(self, interval):
+        super().__init__(name='profiling-sampler', daemon=True)
+        self.interval = interval
+        self.counts = collections.Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == self.ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, 'thread'))
+                self.counts[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def folded(self, max_bytes=MAX_FOLDED_BYTES):
+        """Most common stacks first, as many as fit in `max_bytes` of JSON, and how many were left out"""
+        lines = []
+        size = 0
+        for stack, count in self.counts.most_common():
+            line = f"{stack} {count}"
+            # Quoted, escaped and comma-separated as it ends up in the log line
+            line_bytes = len(json.dumps(line).encode()) + 2
+            if size + line_bytes > max_bytes:
+                break
+            lines.append(line)
+            size += line_bytes
+        return lines, len(self.counts) - len(lines)
+
+
+class AwsCallTimer:
+    """Times every botocore API call made while active"""
+
+    def __init__(self):
+        self.calls = []
+        self._client_class = None
+        self._original = None
+
+    def __enter__(self):
+        try:
+            from botocore.client import BaseClient
+        except ImportError:
+            return self
+        timer = self
+        original = BaseClient._make_api_call
+
+        def timed_call(client, operation_name, api_params):
+            started = time.perf_counter()
+            try:
+                return original(client, operation_name, api_params)
+            finally:
+                tables = api_params.get('TableName') or ','.join(api_params.get('RequestItems', {})) or None
+                timer.calls.append({
+                    'service': client.meta.service_model.service_name,
+                    'operation': operation_name,
+                    'table': tables,
+                    'ms': round((time.perf_counter() - started) * 1000, 2)
+                })
+
+        self._client_class, self._original = BaseClient, original
+        BaseClient._make_api_call = timed_call
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._client_class is not None:
+            self._client_class._make_api_call = self._original
+        return False
+
+
+def _profile(handler, event, context, trigger):
+    sampler = StackSampler(PROFILE_INTERVAL_SECONDS)
+    started = time.perf_counter()
+    sampler.start()
+    try:
+        with AwsCallTimer() as aws:
+            return handler(event, context)
+    finally:
+        sampler.stop()
+        duration_ms = (time.perf_counter() - started) * 1000
+        folded, dropped_stacks = sampler.folded()
+        print(json.dumps({
+            'message': 'profile',
+            'handler': handler.__module__,
+            'request_id': getattr(context, 'aws_request_id', None),
+            'trigger': trigger,
+            'duration_ms': round(duration_ms, 2),
+            'interval_ms': PROFILE_INTERVAL_SECONDS * 1000,
+            'samples': sampler.samples,
+            'aws_calls': aws.calls,
+            'aws_ms': round(sum(call['ms'] for call in aws.calls), 2),
+            'folded': folded,
+            'dropped_stacks': dropped_stacks
+        }))
+
+
+def profiled(handler):
+    """
+    Decorator profiling requests selected by the X-Profile header or
+    PROFILE_SAMPLE_RATE. Returns `handler` itself when neither is configured.
+    """
+    if not PROFILE_SECRET and PROFILE_SAMPLE_RATE <= 0:
+        return handler
+
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        if PROFILE_SECRET and _requested(event):
+            return _profile(handler, event, context, 'header')
+        if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+            return _profile(handler, event, context, 'sample')
+        return handler(event, context)
+    return wrapper
@@ -0,0 +1,124 @@
+import boto3
+import functools
+import json
+import os
+import time
+from collections import OrderedDict
+
+dynamodb = boto3.resource('dynamodb')
+rate_limits_table = dynamodb.Table(os.environ['RATE_LIMIT_TABLE'])
+
+LOCAL_BUCKETS_SIZE = 10000
+
+
+def source_ip(event):
+    request_context = event.get('requestContext') or {}
+    return (request_context.get('http') or {}).get('sourceIp') \
+        or (request_context.get('identity') or {}).get('sourceIp') \
+        or 'unknown'
+
+
+class RateLimiter:
+    """
+    Two-level limiter for one kind of subject (source IP, username, ...).
+
+    A token bucket held in the container rejects floods without any AWS call.
+    Requests that pass it are counted in a shared fixed-window counter in
+    DynamoDB (one conditional ADD, expired by TTL) so the limit holds across
+    containers. Once the shared limit trips, the subject is blocked locally for
+    the rest of the window, so further attempts are free again.
+    """
+
+    def __init__(self, scope, burst, refill_per_second, window_limit, window_seconds):
+        self.scope = scope
+        self.burst = burst
+        self.refill_per_second = refill_per_second
+        self.window_limit = window_limit
+        self.window_seconds = window_seconds
+        self._buckets = OrderedDict()  # subject -> [tokens, updated_at, blocked_until]
+
+    def _local_bucket(self, subject, now):
+        bucket = self._buckets.get(subject)
+        if bucket is None:
+            bucket = [float(self.burst), now, 0.0]
+            self._buckets[subject] = bucket
+            if len(self._buckets) > LOCAL_BUCKETS_SIZE:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(subject)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.refill_per_second)
+            bucket[1] = now
+        return bucket
+
+    def _shared_allow(self, subject, now):
+        window_start = int(now // self.window_seconds) * self.window_seconds
+        try:
+            rate_limits_table.update_item(
+                Key={'limit_key': f"{self.scope}#{subject}#{window_start}"},
+                UpdateExpression='ADD hits :one SET expires_at = :expires_at',
+                ConditionExpression='attribute_not_exists(hits) OR hits < :limit',
+                ExpressionAttributeValues={
+                    ':one': 1,
+                    ':limit': self.window_limit,
+                    ':expires_at': window_start + 2 * self.window_seconds
+                }
+            )
+            return True, 0
+        except rate_limits_table.meta.client.exceptions.ConditionalCheckFailedException:
+            return False, window_start + self.window_seconds
+        except Exception as e:
+            # Throttling must never lock users out because the limiter itself is failing
+            print(f"Rate limit check failed open for {self.scope}: {str(e)}")
+            return True, 0
+
+    def check(self, subject):
+        """Return None if the attempt is allowed, otherwise the seconds to wait before retrying"""
+        now = time.time()
+        bucket = self._local_bucket(subject, now)
+        if bucket[2] > now:
+            return int(bucket[2] - now) + 1
+        if bucket[0] < 1:
+            return int((1 - bucket[0]) / self.refill_per_second) + 1
+        bucket[0] -= 1
+
+        allowed, blocked_until = self._shared_allow(subject, now)
+        if not allowed:
+            bucket[2] = blocked_until
+            return int(blocked_until - now) + 1
+        return None
+
+
+def too_many_requests(retry_after, methods='POST, OPTIONS', allow_headers='Content-Type'):
+    return {
+        'statusCode': 429,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': methods,
+            'Access-Control-Allow-Headers': allow_headers,
+            'Retry-After': str(retry_after)
+        },
+        'body': json.dumps({
+            'error': 'Too many attempts, please try again later',
+            'retry_after': retry_after
+        })
+    }
+
+
+def rate_limited(limiter, subject=source_ip, methods='POST, OPTIONS', allow_headers='Content-Type', replay=None):
+    """
+    Decorator answering 429 once `limiter` rejects the subject of the request.
+    Apply it outside @idempotent so rejected attempts never claim or release a key,
+    and pass `replay` (event -> stored response or None, e.g. idempotency.stored_response)
+    so a rejected retry of a request that already succeeded still gets its response.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            retry_after = limiter.check(subject(event))
+            if retry_after:
+                replayed = replay(event) if replay else None
+                return replayed or too_many_requests(retry_after, methods, allow_headers)
+            return handler(event, context)
+        return wrapper
+    return decorator
@@ -0,0 +1,155 @@
+import boto3
+import json
+import os
+from boto3.dynamodb.conditions import Key
+import standings
+from batch_fetch import query_all
+from profiling import profiled
+from warmup import warm
+
+dynamodb = boto3.resource('dynamodb')
+matches_table = dynamodb.Table(os.environ['MATCHES_TABLE'])
+standings_table = dynamodb.Table(os.environ['STANDINGS_TABLE'])
+
+# Rows that keep changing under a live event are left for the next run
+MAX_RECONCILE_ATTEMPTS = 3
+
+
+def unchanged_condition(stored):
+    """Write arguments that only succeed while the row still holds the counters read in `stored`"""
+    if stored is None:
+        return {'ConditionExpression': 'attribute_not_exists(team_id)'}
+    names = {}
+    values = {}
+    clauses = []
+    for i, counter in enumerate(standings.COUNTERS):
+        names[f'#c{i}'] = counter
+        if counter in stored:
+            values[f':c{i}'] = stored[counter]
+            clauses.append(f'#c{i} = :c{i}')
+        else:
+            clauses.append(f'attribute_not_exists(#c{i})')
+    kwargs = {'ConditionExpression': ' AND '.join(clauses), 'ExpressionAttributeNames': names}
+    if values:
+        kwargs['ExpressionAttributeValues'] = values
+    return kwargs
+
+
+def reconcile(event_id):
+    """
+    Recompute an event's standings from its matches and rewrite only the rows
+    that drifted. Returns the repaired team ids, those changed concurrently and
+    the matches read.
+    """
+    # Standings first: a result landing between the two reads is then in the
+    # matches but not in the rows read, and the condition below catches it
+    current = {row['team_id']: row for row in query_all(
+        standings_table, KeyConditionExpression=Key('event_id').eq(event_id), ConsistentRead=True)}
+    matches = query_all(matches_table, KeyConditionExpression=Key('event_id').eq(event_id), ConsistentRead=True)
+    expected = standings.compute_table(matches)
+
+    # batch_writer cannot carry conditions; drift is rare, so rows are written one by one
+    repaired = []
+    conflicts = []
+    for team_id in list(expected) + [team_id for team_id in current if team_id not in expected]:
+        stored = current.get(team_id)
+        row = expected.get(team_id)
+        if stored is not None and row is not None and all(
+                int(stored.get(counter, 0)) == row[counter] for counter in standings.COUNTERS):
+            continue
+        try:
+            if row is None:
+                standings_table.delete_item(Key={'event_id': event_id, 'team_id': team_id}, **unchanged_condition(stored))
+            else:
+                standings_table.put_item(Item={'event_id': event_id, **row}, **unchanged_condition(stored))
+            repaired.append(team_id)
+        except standings_table.meta.client.exceptions.ConditionalCheckFailedException:
+            # A result moved the row after we read it; never overwrite that ADD
+            conflicts.append(team_id)
+    return repaired, conflicts, matches
+
+
+def fill_sources(event_id, matches):
+    """
+    Put decided teams into matches whose home_source/away_source is still unfilled,
+    e.g. when a result was recorded before submit_result advanced teams. Returns
+    the match ids filled.
+    """
+    resolved = standings.resolved_sources(matches)
+    filled = []
+    for match in matches:
+        if match.get('status') == 'completed':
+            continue
+        for side in ('home', 'away'):
+            team = resolved.get(match.get(f'{side}_source'))
+            if team is None or match.get(f'{side}_team_id'):
+                continue
+            team_id, team_name = team
+            update = f'SET {side}_team_id = :team_id'
+            values = {':team_id': team_id, ':completed': 'completed'}
+            if team_name:
+                update += f', {side}_team_name = :team_name'
+                values[':team_name'] = team_name
+            try:
+                matches_table.update_item(
+                    Key={'event_id': event_id, 'match_id': match['match_id']},
+                    UpdateExpression=update,
+                    # Never replace a team submit_result put in meanwhile
+                    ConditionExpression=f'attribute_exists(match_id) AND attribute_not_exists({side}_team_id) AND #status <> :completed',
+                    ExpressionAttributeNames={'#status': 'status'},
+                    ExpressionAttributeValues=values
+                )
+                filled.append(match['match_id'])
+            except matches_table.meta.client.exceptions.ConditionalCheckFailedException:
+                pass
+    return filled
+
+
+def rebuild(event_id):
+    """Reconcile, reading again while results keep moving rows under us, then fill unresolved sources"""
+    repaired = []
+    for _ in range(MAX_RECONCILE_ATTEMPTS):
+        fixed, conflicts, matches = reconcile(event_id)
+        repaired += fixed
+        if not conflicts:
+            break
+    return repaired, conflicts, fill_sources(event_id, matches)
+
+
+@warm(tables=[matches_table, standings_table])
+@profiled
+def lambda_handler(event, context):
+    """
+    Reconcile an event's standings with its match results and fill in knockout
+    participants that were decided but never advanced.
+    Invoked directly (console, CLI or a schedule) with {"event_id": ...}
+    """
+    event_id = event.get('event_id')
+    if not event_id:
+        return {
+            'statusCode': 400,
+            'body': json.dumps({'error': 'event_id is required'})
+        }
+
+    try:
+        repaired, conflicts, filled = rebuild(event_id)
+        if repaired or conflicts or filled:
+            print(f"Rebuilt standings for {event_id}: {len(repaired)} rows repaired, "
+                  f"{len(conflicts)} skipped as they kept changing, {len(filled)} match participants filled")
+        return {
+            'statusCode': 200,
+            'body': json.dumps({
+                'result': 'success',
+                'event_id': event_id,
+                'rows_repaired': len(repaired),
+                'rows_skipped': len(conflicts),
+                'participants_filled': len(filled)
+            })
+        }
+
+    except Exception as e:
+        print(f"Error rebuilding standings: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': str(e)})
+        }
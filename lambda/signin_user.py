@@ -5,10 +5,18 @@ import hashlib
 import uuid
 from datetime import datetime, timedelta
 from boto3.dynamodb.conditions import Key
+from validation import compile_schema, validated
+from rate_limit import RateLimiter, source_ip, too_many_requests
+from profiling import profiled
+from warmup import warm
 
 dynamodb = boto3.resource('dynamodb')
 table = dynamodb.Table(os.environ['USER_TABLE'])
 
+# Credential stuffing spreads over usernames, guessing concentrates on one; limit both
+ip_limiter = RateLimiter('signin-ip', burst=20, refill_per_second=0.5, window_limit=100, window_seconds=300)
+username_limiter = RateLimiter('signin-user', burst=5, refill_per_second=1 / 60, window_limit=10, window_seconds=900)
+
 def generate_mock_jwt_token(user_data):
     """Generate a simple mock JWT token for testing"""
     import base64
@@ -26,16 +34,18 @@ def generate_mock_jwt_token(user_data):
     
     return token, datetime.utcnow() + timedelta(weeks=2)
 
+validate_body = compile_schema({
+    'username': {'type': 'string', 'required': True, 'max_length': 128},
+    # Bounds the cost of hashing attacker-supplied passwords
+    'password': {'type': 'string', 'required': True, 'max_length': 1024}
+})
+
+@warm(tables=[table])
+@profiled
+@validated(validate_body)
 def lambda_handler(event, context):
     try:
-        # Parse the request body
-        if 'body' in event:
-            if isinstance(event['body'], str):
-                body = json.loads(event['body'])
-            else:
-                body = event['body']
-        else:
-            body = event
+        body = event['body']
 
         # Extract username and password from request
         username = body.get('username')
@@ -56,6 +66,11 @@ def lambda_handler(event, context):
                 })
             }
 
+        # Reject floods before paying for the password hash and the username lookup
+        retry_after = ip_limiter.check(source_ip(event)) or username_limiter.check(username.lower())
+        if retry_after:
+            return too_many_requests(retry_after)
+
         # Hash the provided password to compare with stored hash
         password_hash = hashlib.sha256(password.encode()).hexdigest()
 
@@ -0,0 +1,129 @@
+"""
+Shared standings logic for submit_result.py, get_standings.py and rebuild_standings.py.
+
+Standings rows live in the standings table keyed by (event_id, team_id) and hold
+plain counters so a result can be applied with a single atomic ADD:
+played, won, drawn, lost, goals_for, goals_against, points.
+"""
+POINTS_FOR_WIN = 3
+POINTS_FOR_DRAW = 1
+
+COUNTERS = ('played', 'won', 'drawn', 'lost', 'goals_for', 'goals_against', 'points')
+
+# Only these stages feed the table; knockout results just decide who advances
+TABLE_STAGES = ('league', 'group')
+
+
+def empty_row():
+    return {counter: 0 for counter in COUNTERS}
+
+
+def result_deltas(home_score, away_score):
+    """Counter increments for the home and away team of one result"""
+    home = empty_row()
+    away = empty_row()
+    home['played'] = away['played'] = 1
+    home['goals_for'] = away['goals_against'] = home_score
+    home['goals_against'] = away['goals_for'] = away_score
+    if home_score > away_score:
+        home['won'] = away['lost'] = 1
+        home['points'] = POINTS_FOR_WIN
+    elif home_score < away_score:
+        home['lost'] = away['won'] = 1
+        away['points'] = POINTS_FOR_WIN
+    else:
+        home['drawn'] = away['drawn'] = 1
+        home['points'] = away['points'] = POINTS_FOR_DRAW
+    return home, away
+
+
+def subtract(new, old):
+    return {counter: new[counter] - old[counter] for counter in COUNTERS}
+
+
+def correction_deltas(old_scores, new_scores):
+    """
+    Increments that move the table from `old_scores` (None when the match had no
+    result yet) to `new_scores`, for the home and away team
+    """
+    home, away = result_deltas(*new_scores)
+    if old_scores is None:
+        return home, away
+    old_home, old_away = result_deltas(*old_scores)
+    return subtract(home, old_home), subtract(away, old_away)
+
+
+def compute_table(matches):
+    """Recompute every row from scratch; used to reconcile drift"""
+    rows = {}
+    for match in matches:
+        if match.get('stage') not in TABLE_STAGES:
+            continue
+        home_id = match.get('home_team_id')
+        away_id = match.get('away_team_id')
+        if not home_id or not away_id:
+            continue
+        for team_id, side in ((home_id, 'home'), (away_id, 'away')):
+            if team_id not in rows:
+                rows[team_id] = {'team_id': team_id, **empty_row()}
+                if match.get(f'{side}_team_name'):
+                    rows[team_id]['team_name'] = match[f'{side}_team_name']
+                if match.get('group'):
+                    rows[team_id]['group'] = match['group']
+        if match.get('status') != 'completed':
+            continue
+        home, away = result_deltas(int(match['home_score']), int(match['away_score']))
+        for team_id, delta in ((home_id, home), (away_id, away)):
+            for counter in COUNTERS:
+                rows[team_id][counter] += delta[counter]
+    return rows
+
+
+def sort_table(rows):
+    """
+    Order rows by group, then points, goal difference and goals scored, and
+    number positions within each group
+    """
+    table = []
+    for row in rows:
+        entry = {'team_id': row['team_id']}
+        if row.get('team_name'):
+            entry['team_name'] = row['team_name']
+        if row.get('group'):
+            entry['group'] = row['group']
+        for counter in COUNTERS:
+            entry[counter] = int(row.get(counter, 0))
+        entry['goal_difference'] = entry['goals_for'] - entry['goals_against']
+        table.append(entry)
+
+    table.sort(key=lambda e: (e.get('group', ''), -e['points'], -e['goal_difference'], -e['goals_for'], e.get('team_name', e['team_id'])))
+    position = 0
+    current_group = None
+    for entry in table:
+        if entry.get('group') != current_group:
+            current_group = entry.get('group')
+            position = 0
+        position += 1
+        entry['position'] = position
+    return table
+
+
+def resolved_sources(matches):
+    """
+    Participant sources decided by `matches` -> (team_id, team_name): the winner of
+    every completed knockout match (winner:<match_id>), and every position of each
+    group whose matches, all of which must be given, are completed (group:<G>:<n>)
+    """
+    resolved = {}
+    groups = {}
+    for match in matches:
+        if match.get('stage') == 'knockout' and match.get('winner_team_id'):
+            side = 'home' if match['winner_team_id'] == match.get('home_team_id') else 'away'
+            resolved[f"winner:{match['match_id']}"] = (match['winner_team_id'], match.get(f'{side}_team_name'))
+        elif match.get('stage') == 'group':
+            groups.setdefault(match['group'], []).append(match)
+    for group, group_matches in groups.items():
+        if all(match.get('status') == 'completed' for match in group_matches):
+            for row in sort_table(compute_table(group_matches).values()):
+                resolved[f"group:{group}:{row['position']}"] = (row['team_id'], row.get('team_name'))
+    return resolved
@@ -0,0 +1,201 @@
+"""
+DynamoDB Streams consumer that keeps precomputed counters in the summaries table
+so dashboards can read them with a single get_item:
+
+    user#<user_id>    events (organized), teams (captained)
+    team#<team_id>    sub_teams
+    event#<event_id>  child_events, registrations
+
+Archiving does not change the counters: archive_events.py marks events and
+registrations with archive.ARCHIVED_ATTRIBUTE before deleting them, and REMOVE
+records whose old image carries the marker are skipped. The marking MODIFY
+records change nothing either, since both images contribute the same counters.
+
+Each applied stream record leaves an `applied#<eventID>` ledger item (expiring
+after the 24h stream retention) written in the same transaction as its counter
+updates, so redelivered records are skipped no matter how Lambda re-batches them.
+
+summarize_records() is pure, so synthetic stream batches can be checked locally
+without AWS.
+"""
+import boto3
+import os
+import time
+import archive
+from profiling import profiled
+from warmup import warm
+
+dynamodb = boto3.resource('dynamodb')
+summaries_table = dynamodb.Table(os.environ['SUMMARIES_TABLE'])
+client = dynamodb.meta.client
+
+SOURCE_TABLES = {
+    os.environ['EVENTS_TABLE']: 'events',
+    os.environ['TEAMS_TABLE']: 'teams',
+    os.environ['EVENT_REGISTRATIONS_TABLE']: 'registrations'
+}
+LEDGER_TTL_SECONDS = 2 * 24 * 60 * 60
+MAX_TRANSACT_ITEMS = 100
+
+
+def source_of(record):
+    # arn:aws:dynamodb:region:account:table/<name>/stream/<label>
+    table_name = record['eventSourceARN'].split(':table/', 1)[1].split('/', 1)[0]
+    return SOURCE_TABLES.get(table_name)
+
+
+def image_value(image, name):
+    if not image or name not in image:
+        return None
+    value = image[name]
+    return value.get('S') if isinstance(value, dict) else value
+
+
+def image_counters(source, image):
+    """Counters an item contributes to while it exists"""
+    counters = []
+    if not image:
+        return counters
+    if source == 'events':
+        if image_value(image, 'organizer_id'):
+            counters.append((f"user#{image_value(image, 'organizer_id')}", 'events'))
+        if image_value(image, 'parent_event_id'):
+            counters.append((f"event#{image_value(image, 'parent_event_id')}", 'child_events'))
+    elif source == 'teams':
+        if image_value(image, 'team_captain_id'):
+            counters.append((f"user#{image_value(image, 'team_captain_id')}", 'teams'))
+        if image_value(image, 'parent_team_id'):
+            counters.append((f"team#{image_value(image, 'parent_team_id')}", 'sub_teams'))
+    elif source == 'registrations':
+        if image_value(image, 'event_id'):
+            counters.append((f"event#{image_value(image, 'event_id')}", 'registrations'))
+    return counters
+
+
+def archived_removal(images):
+    """True for the REMOVE of an item that archive_events moved to the archive"""
+    old_image = images.get('OldImage') or {}
+    return not images.get('NewImage') and old_image.get(archive.ARCHIVED_ATTRIBUTE) in ({'BOOL': True}, True)
+
+
+def record_deltas(record):
+    """
+    {summary_id: {counter: delta}} for one stream record. Deltas are the
+    difference between what the old and new image contribute, which also covers
+    MODIFY records that move an item to another organizer/parent. Archival
+    deletes change nothing.
+    """
+    source = source_of(record)
+    if source is None:
+        return {}
+    images = record.get('dynamodb', {})
+    if archived_removal(images):
+        return {}
+    deltas = {}
+    for counter, sign in [(c, -1) for c in image_counters(source, images.get('OldImage'))] + \
+                         [(c, 1) for c in image_counters(source, images.get('NewImage'))]:
+        summary_id, name = counter
+        counters = deltas.setdefault(summary_id, {})
+        counters[name] = counters.get(name, 0) + sign
+    return {summary_id: {name: delta for name, delta in counters.items() if delta}
+            for summary_id, counters in deltas.items()
+            if any(counters.values())}
+
+
+def summarize_records(records):
+    """[(record, deltas)] for the records of a batch that change any counter"""
+    summarized = []
+    for record in records:
+        deltas = record_deltas(record)
+        if deltas:
+            summarized.append((record, deltas))
+    return summarized
+
+
+def build_transaction(chunk, expires_at):
+    """Ledger puts first (one per record) followed by one merged ADD per summary item"""
+    merged = {}
+    for _, deltas in chunk:
+        for summary_id, counters in deltas.items():
+            target = merged.setdefault(summary_id, {})
+            for name, delta in counters.items():
+                target[name] = target.get(name, 0) + delta
+
+    items = []
+    for record, _ in chunk:
+        items.append({
+            'Put': {
+                'TableName': summaries_table.name,
+                'Item': {'summary_id': f"applied#{record['eventID']}", 'expires_at': expires_at},
+                'ConditionExpression': 'attribute_not_exists(summary_id)'
+            }
+        })
+    for summary_id, counters in merged.items():
+        counters = {name: delta for name, delta in counters.items() if delta}
+        if not counters:
+            continue
+        names = {f'#c{i}': name for i, name in enumerate(counters)}
+        values = {f':c{i}': delta for i, delta in enumerate(counters.values())}
+        items.append({
+            'Update': {
+                'TableName': summaries_table.name,
+                'Key': {'summary_id': summary_id},
+                'UpdateExpression': 'ADD ' + ', '.join(f'#c{i} :c{i}' for i in range(len(counters))),
+                'ExpressionAttributeNames': names,
+                'ExpressionAttributeValues': values
+            }
+        })
+    return items
+
+
+def apply_chunk(chunk):
+    """Apply a chunk atomically, dropping records whose ledger entry shows they were already applied"""
+    while chunk:
+        items = build_transaction(chunk, int(time.time()) + LEDGER_TTL_SECONDS)
+        try:
+            client.transact_write_items(TransactItems=items)
+            return
+        except client.exceptions.TransactionCanceledException as e:
+            reasons = e.response.get('CancellationReasons', [])
+            applied = {i for i, reason in enumerate(reasons[:len(chunk)]) if reason.get('Code') == 'ConditionalCheckFailed'}
+            if not applied:
+                raise
+            chunk = [entry for i, entry in enumerate(chunk) if i not in applied]
+
+
+def chunks_of(summarized):
+    """Split records so every transaction stays within the TransactWriteItems item limit"""
+    chunk = []
+    summary_ids = set()
+    for record, deltas in summarized:
+        new_ids = summary_ids | set(deltas)
+        if chunk and len(chunk) + 1 + len(new_ids) > MAX_TRANSACT_ITEMS:
+            yield chunk
+            chunk = []
+            new_ids = set(deltas)
+        chunk.append((record, deltas))
+        summary_ids = new_ids
+    if chunk:
+        yield chunk
+
+
+@warm(tables=[summaries_table])
+@profiled
+def lambda_handler(event, context):
+    """
+    Streams event source handler. Reports the first record of a failed chunk
+    so Lambda retries from there (ReportBatchItemFailures).
+    """
+    records = event.get('Records', [])
+    summarized = summarize_records(records)
+
+    for chunk in chunks_of(summarized):
+        try:
+            apply_chunk(chunk)
+        except Exception as e:
+            first = chunk[0][0]
+            print(f"Error applying stream records from {first['eventID']}: {str(e)}")
+            return {'batchItemFailures': [{'itemIdentifier': first['dynamodb']['SequenceNumber']}]}
+
+    print(f"Applied {len(summarized)} of {len(records)} stream records")
+    return {'batchItemFailures': []}
@@ -0,0 +1,325 @@
+import boto3
+import json
+import os
+import random
+import time
+import standings
+from batch_fetch import batch_get_items, query_all
+from boto3.dynamodb.conditions import Attr, Key
+from validation import compile_schema, validated
+from profiling import profiled
+from warmup import warm
+
+dynamodb = boto3.resource('dynamodb')
+events_table = dynamodb.Table(os.environ['EVENTS_TABLE'])
+matches_table = dynamodb.Table(os.environ['MATCHES_TABLE'])
+standings_table = dynamodb.Table(os.environ['STANDINGS_TABLE'])
+client = dynamodb.meta.client
+
+# Many results of one division land on the same standings rows; conflicting
+# transactions are cancelled rather than queued, so retry a few times
+MAX_TRANSACTION_ATTEMPTS = 5
+# A result whose group or dependants changed under it is read and computed again
+MAX_READ_ATTEMPTS = 5
+
+validate_body = compile_schema({
+    'organizer_id': {'type': 'string', 'required': True, 'max_length': 128},
+    'home_score': {'type': 'integer', 'required': True, 'minimum': 0, 'maximum': 1000},
+    'away_score': {'type': 'integer', 'required': True, 'minimum': 0, 'maximum': 1000}
+})
+
+
+def error_response(status_code, message):
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'POST, OPTIONS',
+            'Access-Control-Allow-Headers': 'Content-Type'
+        },
+        'body': json.dumps({'error': message})
+    }
+
+
+def related_matches(event_id, match):
+    """
+    Matches that may take a team from this result: those fed by the winner of a
+    knockout match, or a group's other matches and those fed by its positions
+    """
+    if match.get('stage') not in ('knockout', 'group'):
+        return []
+    if 'feeds' in match:
+        match_ids = set(match['feeds']) | set(match.get('group_match_ids', []))
+        match_ids.discard(match['match_id'])
+        return batch_get_items(client, matches_table.name,
+                               [{'event_id': event_id, 'match_id': match_id} for match_id in match_ids],
+                               consistent_read=True)
+
+    # Fixtures generated before `feeds` existed: filter the event's whole partition
+    if match.get('stage') == 'knockout':
+        source = f"winner:{match['match_id']}"
+        match_filter = Attr('home_source').eq(source) | Attr('away_source').eq(source)
+    else:
+        prefix = f"group:{match['group']}:"
+        match_filter = (Attr('group').eq(match['group'])
+                        | Attr('home_source').begins_with(prefix)
+                        | Attr('away_source').begins_with(prefix))
+    return query_all(matches_table, KeyConditionExpression=Key('event_id').eq(event_id), FilterExpression=match_filter)
+
+
+def group_siblings(match, related):
+    """The other matches of a group match's group"""
+    if match.get('stage') != 'group':
+        return []
+    return [other for other in related
+            if other.get('stage') == 'group' and other.get('group') == match['group'] and other['match_id'] != match['match_id']]
+
+
+def advancing_teams(match, home_score, away_score, related):
+    """
+    Sources decided by this result -> (team_id, team_name): the winner of a knockout
+    match, or every position of its group once all of the group's matches are completed
+    """
+    played = {**match, 'status': 'completed', 'home_score': home_score, 'away_score': away_score}
+    if match.get('stage') == 'knockout':
+        played['winner_team_id'] = match['home_team_id'] if home_score > away_score else match['away_team_id']
+    return standings.resolved_sources([played] + group_siblings(match, related))
+
+
+def dependent_changes(teams, related):
+    """(match, {side: (team_id, team_name)}) for every match whose participants have to change"""
+    changes = []
+    for dependent in related:
+        sides = {}
+        for side in ('home', 'away'):
+            team = teams.get(dependent.get(f'{side}_source'))
+            if team and dependent.get(f'{side}_team_id') != team[0]:
+                sides[side] = team
+        if sides:
+            changes.append((dependent, sides))
+    return changes
+
+
+def participant_update(event_id, dependent, sides):
+    names = {'#status': 'status'}
+    values = {':completed': 'completed'}
+    sets = []
+    removes = []
+    for side, (team_id, team_name) in sides.items():
+        sets.append(f'{side}_team_id = :{side}_team_id')
+        values[f':{side}_team_id'] = team_id
+        if team_name:
+            sets.append(f'{side}_team_name = :{side}_team_name')
+            values[f':{side}_team_name'] = team_name
+        else:
+            removes.append(f'{side}_team_name')
+    update = 'SET ' + ', '.join(sets)
+    if removes:
+        update += ' REMOVE ' + ', '.join(removes)
+
+    return {
+        'Update': {
+            'TableName': matches_table.name,
+            'Key': {'event_id': event_id, 'match_id': dependent['match_id']},
+            'UpdateExpression': update,
+            # A match that has been played keeps the teams that played it
+            'ConditionExpression': 'attribute_exists(match_id) AND #status <> :completed',
+            'ExpressionAttributeNames': names,
+            'ExpressionAttributeValues': values
+        }
+    }
+
+
+def unchanged_check(event_id, sibling):
+    """
+    Hold the transaction to the sibling's result as read: two of a group's last
+    results submitted together would otherwise each see the other as unplayed,
+    and neither would fill in the group's finishers
+    """
+    names = {'#status': 'status'}
+    values = {':status': sibling['status']}
+    condition = '#status = :status'
+    if sibling['status'] == 'completed':
+        condition += ' AND home_score = :home_score AND away_score = :away_score'
+        values[':home_score'] = sibling['home_score']
+        values[':away_score'] = sibling['away_score']
+    return {
+        'ConditionCheck': {
+            'TableName': matches_table.name,
+            'Key': {'event_id': event_id, 'match_id': sibling['match_id']},
+            'ConditionExpression': condition,
+            'ExpressionAttributeNames': names,
+            'ExpressionAttributeValues': values
+        }
+    }
+
+
+def standings_update(event_id, team_id, delta, match, side):
+    names = {}
+    values = {}
+    adds = []
+    for i, counter in enumerate(standings.COUNTERS):
+        names[f'#c{i}'] = counter
+        values[f':c{i}'] = delta[counter]
+        adds.append(f'#c{i} :c{i}')
+    update = 'ADD ' + ', '.join(adds)
+
+    sets = []
+    if match.get(f'{side}_team_name'):
+        sets.append('team_name = if_not_exists(team_name, :team_name)')
+        values[':team_name'] = match[f'{side}_team_name']
+    if match.get('group'):
+        names['#group'] = 'group'
+        sets.append('#group = if_not_exists(#group, :group)')
+        values[':group'] = match['group']
+    if sets:
+        update += ' SET ' + ', '.join(sets)
+
+    return {
+        'Update': {
+            'TableName': standings_table.name,
+            'Key': {'event_id': event_id, 'team_id': team_id},
+            'UpdateExpression': update,
+            'ExpressionAttributeNames': names,
+            'ExpressionAttributeValues': values
+        }
+    }
+
+
+def match_update(event_id, match, home_score, away_score):
+    names = {'#status': 'status'}
+    values = {
+        ':home_score': home_score,
+        ':away_score': away_score,
+        ':completed': 'completed'
+    }
+    update = 'SET home_score = :home_score, away_score = :away_score, #status = :completed'
+    if match.get('stage') == 'knockout':
+        values[':winner'] = match['home_team_id'] if home_score > away_score else match['away_team_id']
+        update += ', winner_team_id = :winner'
+
+    # The standings deltas were computed from the result we read, so it must not have changed since
+    if match.get('status') == 'completed':
+        condition = 'home_score = :old_home AND away_score = :old_away'
+        values[':old_home'] = match['home_score']
+        values[':old_away'] = match['away_score']
+    else:
+        condition = 'attribute_exists(match_id) AND #status <> :completed'
+
+    return {
+        'Update': {
+            'TableName': matches_table.name,
+            'Key': {'event_id': event_id, 'match_id': match['match_id']},
+            'UpdateExpression': update,
+            'ConditionExpression': condition,
+            'ExpressionAttributeNames': names,
+            'ExpressionAttributeValues': values
+        }
+    }
+
+
+def apply_result(event_id, match, home_score, away_score, related=(), changes=()):
+    """
+    Record the result, move both standings rows and put the teams it decides
+    into the matches they advance to, in one transaction that only commits while
+    the rest of the group is as read
+    """
+    items = [match_update(event_id, match, home_score, away_score)]
+    items += [participant_update(event_id, dependent, sides) for dependent, sides in changes]
+    items += [unchanged_check(event_id, sibling) for sibling in group_siblings(match, related)]
+    if match.get('stage') in standings.TABLE_STAGES:
+        old_scores = None
+        if match.get('status') == 'completed':
+            old_scores = (int(match['home_score']), int(match['away_score']))
+        home_delta, away_delta = standings.correction_deltas(old_scores, (home_score, away_score))
+        items.append(standings_update(event_id, match['home_team_id'], home_delta, match, 'home'))
+        items.append(standings_update(event_id, match['away_team_id'], away_delta, match, 'away'))
+
+    for attempt in range(MAX_TRANSACTION_ATTEMPTS):
+        try:
+            client.transact_write_items(TransactItems=items)
+            return
+        except client.exceptions.TransactionCanceledException as e:
+            reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+            if 'ConditionalCheckFailed' in reasons or attempt == MAX_TRANSACTION_ATTEMPTS - 1:
+                raise
+            time.sleep(0.02 * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+
+@warm(tables=[events_table, matches_table, standings_table])
+@profiled
+@validated(validate_body)
+def lambda_handler(event, context):
+    """
+    Submit or correct the result of a match and update the event standings.
+    Knockout winners and final group positions are filled into the matches they feed.
+    Expected path parameters: eventId, matchId
+    Body: organizer_id, home_score, away_score
+    """
+    path_parameters = event.get('pathParameters', {})
+    event_id = path_parameters.get('eventId')
+    match_id = path_parameters.get('matchId')
+    body = event['body']
+
+    organizer_id = body.get('organizer_id')
+    home_score = body.get('home_score')
+    away_score = body.get('away_score')
+
+    if not event_id or not match_id:
+        return error_response(400, 'event_id and match_id are required')
+
+    try:
+        get_response = events_table.get_item(Key={'id': event_id}, ProjectionExpression='organizer_id')
+        if 'Item' not in get_response:
+            return error_response(404, 'Event not found')
+        if get_response['Item']['organizer_id'] != organizer_id:
+            return error_response(403, 'Unauthorized: Only event organizer can submit results')
+
+        for attempt in range(MAX_READ_ATTEMPTS):
+            match = matches_table.get_item(Key={'event_id': event_id, 'match_id': match_id}, ConsistentRead=True).get('Item')
+            if match is None:
+                return error_response(404, 'Match not found')
+            if not match.get('home_team_id') or not match.get('away_team_id'):
+                return error_response(409, 'Both teams of this match are not known yet')
+            if match.get('stage') == 'knockout' and home_score == away_score:
+                return error_response(400, 'Knockout matches need a winner')
+
+            related = related_matches(event_id, match)
+            changes = dependent_changes(advancing_teams(match, home_score, away_score, related), related)
+            played = sorted(dependent['match_id'] for dependent, _ in changes if dependent.get('status') == 'completed')
+            if played:
+                return error_response(409, f"This result changes who played {', '.join(played)}, which already have results")
+
+            try:
+                apply_result(event_id, match, home_score, away_score, related, changes)
+                break
+            except client.exceptions.TransactionCanceledException as e:
+                reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+                # The match itself changed, or writes kept conflicting: let the client decide
+                if reasons[:1] == ['ConditionalCheckFailed'] or 'ConditionalCheckFailed' not in reasons:
+                    return error_response(409, 'The match result changed concurrently; reload and retry')
+        else:
+            return error_response(409, 'Other results of this group keep changing; retry')
+
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*'
+            },
+            'body': json.dumps({
+                'result': 'success',
+                'event_id': event_id,
+                'match_id': match_id,
+                'home_score': home_score,
+                'away_score': away_score
+            })
+        }
+
+    except Exception as e:
+        print(f"Error submitting result: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': str(e)})
+        }
@@ -0,0 +1,121 @@
+import boto3
+import json
+import os
+import versioning
+from validation import compile_schema, validated
+from profiling import profiled
+from warmup import warm
+
+dynamodb = boto3.resource('dynamodb')
+events_table = dynamodb.Table(os.environ['EVENTS_TABLE'])
+
+# Request field -> event attribute. null (or '') removes an optional attribute
+UPDATABLE_FIELDS = {
+    'event_name': 'name',
+    'date_start': 'date_start',
+    'date_end': 'date_end',
+    'location': 'location',
+    'additional_info': 'additional_info'
+}
+NOT_REMOVABLE = {'event_name'}
+
+validate_body = compile_schema({
+    'organizer_id': {'type': 'string', 'required': True, 'max_length': 128},
+    'event_name': {'type': 'string', 'max_length': 200},
+    'date_start': {'type': 'date'},
+    'date_end': {'type': 'date'},
+    'location': {'type': 'string', 'max_length': 500},
+    'additional_info': {'type': 'string', 'max_length': 5000}
+}, checks=[
+    ('date_end', 'must not be before date_start',
+     lambda body: not body.get('date_start') or not body.get('date_end') or body['date_end'] >= body['date_start'])
+])
+
+
+def error_response(status_code, message, headers=None):
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'PATCH, OPTIONS',
+            'Access-Control-Allow-Headers': 'Content-Type, If-Match',
+            **(headers or {})
+        },
+        'body': json.dumps({'error': message})
+    }
+
+
+def date_order_condition(changes):
+    """Keep date_start <= date_end when the request only changes one of them"""
+    if changes.get('date_start') and 'date_end' not in changes:
+        return 'attribute_not_exists(date_end) OR date_end >= :date_start', {':date_start': changes['date_start']}
+    if changes.get('date_end') and 'date_start' not in changes:
+        return 'attribute_not_exists(date_start) OR date_start <= :date_end', {':date_end': changes['date_end']}
+    return None, {}
+
+
+@warm(tables=[events_table])
+@profiled
+@validated(validate_body, methods='PATCH, OPTIONS', allow_headers='Content-Type, If-Match')
+def lambda_handler(event, context):
+    """
+    Update only the given attributes of an event (only by organizer).
+    Expected path parameters: eventId
+    Headers: If-Match with the ETag from GET /event/{eventId} (or *)
+    Body: organizer_id and any of event_name, date_start, date_end, location, additional_info
+    """
+    event_id = event.get('pathParameters', {}).get('eventId')
+    body = event['body']
+    if not event_id:
+        return error_response(400, 'event_id is required')
+
+    try:
+        expected_version = versioning.parse_if_match(event)
+    except ValueError as e:
+        return error_response(400, str(e))
+    if expected_version is None:
+        return error_response(428, 'If-Match header is required; send the ETag of the event being edited')
+
+    changes = {attribute: body[field] or None for field, attribute in UPDATABLE_FIELDS.items() if field in body}
+    if not changes:
+        return error_response(400, f"Nothing to update; send any of {', '.join(UPDATABLE_FIELDS)}")
+    for field in NOT_REMOVABLE:
+        if field in body and not body[field]:
+            return error_response(400, f'{field} cannot be removed')
+
+    date_condition, date_values = date_order_condition(changes)
+    try:
+        response = events_table.update_item(**versioning.build_update(
+            {'id': event_id},
+            changes,
+            expected_version,
+            condition='#organizer_id = :organizer_id' + (f' AND ({date_condition})' if date_condition else ''),
+            names={'#organizer_id': 'organizer_id'},
+            values={':organizer_id': body['organizer_id'], **date_values}
+        ))
+    except events_table.meta.client.exceptions.ConditionalCheckFailedException as e:
+        current = versioning.failed_item(e)
+        if current is None:
+            return error_response(404, 'Event not found')
+        if current['organizer_id'] != body['organizer_id']:
+            return error_response(403, 'Unauthorized: Only event organizer can update the event')
+        if not versioning.version_matches(current, expected_version):
+            return error_response(412, 'The event was changed by someone else; reload it and retry',
+                                  headers={'ETag': versioning.etag(current)})
+        return error_response(400, 'date_end must not be before date_start')
+    except Exception as e:
+        return error_response(500, str(e))
+
+    item = response['Attributes']
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'PATCH, OPTIONS',
+            'Access-Control-Allow-Headers': 'Content-Type, If-Match',
+            'ETag': versioning.etag(item)
+        },
+        'body': json.dumps({'event': item}, default=str)
+    }
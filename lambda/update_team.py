@@ -0,0 +1,102 @@
+import boto3
+import json
+import os
+import versioning
+from validation import compile_schema, validated
+from profiling import profiled
+from warmup import warm
+
+dynamodb = boto3.resource('dynamodb')
+teams_table = dynamodb.Table(os.environ['TEAMS_TABLE'])
+
+# Request field -> team attribute. null (or '') removes an optional attribute
+UPDATABLE_FIELDS = {
+    'team_name': 'name',
+    'parent_team_id': 'parent_team_id'
+}
+NOT_REMOVABLE = {'team_name'}
+
+validate_body = compile_schema({
+    'team_captain_id': {'type': 'string', 'required': True, 'max_length': 128},
+    'team_name': {'type': 'string', 'max_length': 200},
+    'parent_team_id': {'type': 'string', 'max_length': 128}
+})
+
+
+def error_response(status_code, message, headers=None):
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'PATCH, OPTIONS',
+            'Access-Control-Allow-Headers': 'Content-Type, If-Match',
+            **(headers or {})
+        },
+        'body': json.dumps({'error': message})
+    }
+
+
+@warm(tables=[teams_table])
+@profiled
+@validated(validate_body, methods='PATCH, OPTIONS', allow_headers='Content-Type, If-Match')
+def lambda_handler(event, context):
+    """
+    Update only the given attributes of a team (only by team captain).
+    Expected path parameters: teamId
+    Headers: If-Match with the ETag from GET /team/{teamId} (or *)
+    Body: team_captain_id and any of team_name, parent_team_id
+    """
+    team_id = event.get('pathParameters', {}).get('teamId')
+    body = event['body']
+    if not team_id:
+        return error_response(400, 'team_id is required')
+
+    try:
+        expected_version = versioning.parse_if_match(event)
+    except ValueError as e:
+        return error_response(400, str(e))
+    if expected_version is None:
+        return error_response(428, 'If-Match header is required; send the ETag of the team being edited')
+
+    changes = {attribute: body[field] or None for field, attribute in UPDATABLE_FIELDS.items() if field in body}
+    if not changes:
+        return error_response(400, f"Nothing to update; send any of {', '.join(UPDATABLE_FIELDS)}")
+    for field in NOT_REMOVABLE:
+        if field in body and not body[field]:
+            return error_response(400, f'{field} cannot be removed')
+    if changes.get('parent_team_id') == team_id:
+        return error_response(400, 'A team cannot be its own parent')
+
+    try:
+        response = teams_table.update_item(**versioning.build_update(
+            {'id': team_id},
+            changes,
+            expected_version,
+            condition='#team_captain_id = :team_captain_id',
+            names={'#team_captain_id': 'team_captain_id'},
+            values={':team_captain_id': body['team_captain_id']}
+        ))
+    except teams_table.meta.client.exceptions.ConditionalCheckFailedException as e:
+        current = versioning.failed_item(e)
+        if current is None:
+            return error_response(404, 'Team not found')
+        if current['team_captain_id'] != body['team_captain_id']:
+            return error_response(403, 'Unauthorized: Only team captain can update the team')
+        return error_response(412, 'The team was changed by someone else; reload it and retry',
+                              headers={'ETag': versioning.etag(current)})
+    except Exception as e:
+        return error_response(500, str(e))
+
+    item = response['Attributes']
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'PATCH, OPTIONS',
+            'Access-Control-Allow-Headers': 'Content-Type, If-Match',
+            'ETag': versioning.etag(item)
+        },
+        'body': json.dumps({'team': item}, default=str)
+    }
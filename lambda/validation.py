@@ -0,0 +1,200 @@
+"""
+Declarative request body validation for the write endpoints.
+
+Handlers declare their body schema once at module level:
+
+    validate_body = compile_schema({
+        'organizer_id': {'type': 'string', 'required': True, 'max_length': 128},
+        'date_start': {'type': 'date'},
+        'venues': {'type': 'list', 'items': {'type': 'string'}}
+    })
+
+compile_schema() generates the source of a validator with every rule inlined
+and compiles it when the container starts, so a request pays for the checks
+themselves and not for walking the schema. @validated parses the body, answers
+bad requests with a structured 400 before the handler (and any AWS call) runs,
+and passes the parsed body on as event['body'].
+
+Field spec keys: type (string, date, integer, number, boolean, list, object),
+required, default, enum, min_length/max_length (strings and lists),
+minimum/maximum (numbers) and items (a spec for list elements). null, and ''
+for optional fields, count as absent; absent fields with a default get it
+filled into the body.
+"""
+import copy
+import datetime
+import functools
+import json
+import re
+
+SPEC_KEYS = {'type', 'required', 'default', 'enum', 'min_length', 'max_length', 'minimum', 'maximum', 'items'}
+
+# ISO 8601 date, optionally with a time; what datetime.fromisoformat accepts on python3.9 plus 'Z'
+DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}(:\d{2}(\.\d{3}(\d{3})?)?)?(Z|[+-]\d{2}:\d{2})?)?')
+
+
+def _is_date(value):
+    if len(value) == 10:
+        # Plain dates are the common case; date.fromisoformat is stricter and cheaper than the pattern
+        if value[4] != '-' or value[7] != '-':
+            return False
+        try:
+            datetime.date.fromisoformat(value)
+        except ValueError:
+            return False
+        return True
+    if not DATE_PATTERN.fullmatch(value):
+        return False
+    try:
+        datetime.datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+    except ValueError:
+        return False
+    return True
+
+
+# type: (condition true when {v} has the wrong type, message)
+TYPES = {
+    'string': ('not isinstance({v}, str)', 'must be a string'),
+    'date': ('not isinstance({v}, str) or not _is_date({v})', 'must be a date (YYYY-MM-DD or ISO 8601 date-time)'),
+    'integer': ('{v}.__class__ is not int', 'must be an integer'),
+    'number': ('{v}.__class__ is not int and {v}.__class__ is not float', 'must be a number'),
+    'boolean': ('{v}.__class__ is not bool', 'must be true or false'),
+    'list': ('not isinstance({v}, list)', 'must be a list'),
+    'object': ('not isinstance({v}, dict)', 'must be an object')
+}
+
+
+def _rules(spec, var, namespace, depth=0):
+    """
+    [(condition, message expression)] checking `var` against one field spec, in
+    order; the first condition that holds is the error. Constants and helper
+    functions the conditions refer to are added to `namespace`.
+    """
+    unknown = set(spec) - SPEC_KEYS
+    if unknown:
+        raise ValueError(f"Unknown schema keys: {', '.join(sorted(unknown))}")
+    if spec.get('type') not in TYPES:
+        raise ValueError(f"Unknown schema type: {spec.get('type')!r}")
+    type_condition, type_message = TYPES[spec['type']]
+    rules = [(type_condition.format(v=var), repr(type_message))]
+    unit = 'items' if spec['type'] == 'list' else 'characters'
+
+    if 'enum' in spec:
+        name = f'_enum_{len(namespace)}'
+        namespace[name] = frozenset(spec['enum'])
+        rules.append((f'{var} not in {name}', repr(f"must be one of {', '.join(str(option) for option in spec['enum'])}")))
+    if spec.get('min_length') == 1:
+        rules.append((f'not {var}', repr('must not be empty')))
+    elif 'min_length' in spec:
+        rules.append((f"len({var}) < {int(spec['min_length'])}", repr(f"must have at least {spec['min_length']} {unit}")))
+    if 'max_length' in spec:
+        rules.append((f"len({var}) > {int(spec['max_length'])}", repr(f"must have at most {spec['max_length']} {unit}")))
+    if 'minimum' in spec:
+        rules.append((f"{var} < {spec['minimum']!r}", repr(f"must be at least {spec['minimum']}")))
+    if 'maximum' in spec:
+        rules.append((f"{var} > {spec['maximum']!r}", repr(f"must be at most {spec['maximum']}")))
+    if 'items' in spec:
+        item = f'item{depth}'
+        lines = ['def _check_items(value):', f'    for index, {item} in enumerate(value):']
+        for i, (condition, message) in enumerate(_rules(spec['items'], item, namespace, depth + 1)):
+            lines.append(f"        {'if' if i == 0 else 'elif'} {condition}:")
+            lines.append(f"            return f'item {{index}} ' + {message}")
+        lines.append('    return None')
+        name = f'_items_{len(namespace)}'
+        exec('\n'.join(lines), namespace)
+        namespace[name] = namespace.pop('_check_items')
+        rules.append((f'(message := {name}({var})) is not None', 'message'))
+    return rules
+
+
+def compile_schema(fields, checks=()):
+    """
+    Compile {field: spec} into validate(body) -> list of {'field', 'message'}
+    errors (empty when the body is valid). `checks` are cross-field rules as
+    (field, message, predicate(body)) tuples, applied once every field passed.
+    """
+    namespace = {'_is_date': _is_date, 'copy': copy}
+    lines = [
+        'def validate(body):',
+        '    if not isinstance(body, dict):',
+        "        return [{'field': 'body', 'message': 'must be a JSON object'}]",
+        '    errors = []'
+    ]
+    for name, spec in fields.items():
+        field = repr(name)
+        lines.append(f'    value = body.get({field})')
+        lines.append("    if value is None or value == '':")
+        if spec.get('required'):
+            lines.append(f"        errors.append({{'field': {field}, 'message': 'is required'}})")
+        else:
+            lines.append('        pass')
+        for condition, message in _rules(spec, 'value', namespace):
+            lines.append(f'    elif {condition}:')
+            lines.append(f"        errors.append({{'field': {field}, 'message': {message}}})")
+
+    lines.append('    if errors:')
+    lines.append('        return errors')
+    for name, spec in fields.items():
+        if 'default' in spec:
+            default = f'_default_{len(namespace)}'
+            namespace[default] = spec['default']
+            lines.append(f"    if body.get({name!r}) is None or body[{name!r}] == '':")
+            lines.append(f'        body[{name!r}] = copy.deepcopy({default})')
+    if checks:
+        namespace['_checks'] = tuple(checks)
+        lines.append('    for name, message, predicate in _checks:')
+        lines.append('        if not predicate(body):')
+        lines.append("            errors.append({'field': name, 'message': message})")
+    lines.append('    return errors')
+
+    exec('\n'.join(lines), namespace)
+    return namespace['validate']
+
+
+def parse_body(event):
+    """The request body of an API Gateway event, or the event itself for direct invocations"""
+    if 'body' not in event:
+        return event
+    body = event['body']
+    if isinstance(body, str):
+        try:
+            return json.loads(body)
+        except ValueError:
+            raise ValueError('must be valid JSON')
+    return {} if body is None else body
+
+
+def invalid_request(errors, methods='POST, OPTIONS', allow_headers='Content-Type'):
+    return {
+        'statusCode': 400,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': methods,
+            'Access-Control-Allow-Headers': allow_headers
+        },
+        'body': json.dumps({
+            'error': '; '.join(f"{error['field']} {error['message']}" for error in errors),
+            'details': errors
+        })
+    }
+
+
+def validated(validate, methods='POST, OPTIONS', allow_headers='Content-Type'):
+    """
+    Decorator rejecting requests whose body fails `validate` with a 400. Apply it
+    outermost so invalid requests never reach other decorators' AWS calls.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            try:
+                body = parse_body(event)
+            except ValueError as e:
+                return invalid_request([{'field': 'body', 'message': str(e)}], methods, allow_headers)
+            errors = validate(body)
+            if errors:
+                return invalid_request(errors, methods, allow_headers)
+            return handler({**event, 'body': body}, context)
+        return wrapper
+    return decorator
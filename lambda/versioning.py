@@ -0,0 +1,94 @@
+"""
+Optimistic concurrency for partially updated items.
+
+Items carry a numeric `version` attribute (1 on create, items written before
+versioning count as 0) that every update increments. HTTP clients see it as a
+strong ETag and send it back in If-Match; the update only applies if the stored
+version still matches, so concurrent editors cannot overwrite each other.
+"""
+from boto3.dynamodb.types import TypeDeserializer
+
+VERSION_ATTRIBUTE = 'version'
+ANY_VERSION = '*'
+
+_deserializer = TypeDeserializer()
+
+
+def etag(item):
+    return f'"{int(item.get(VERSION_ATTRIBUTE, 0))}"'
+
+
+def parse_if_match(event):
+    """
+    The version pinned by the If-Match header: an int, ANY_VERSION for '*', or
+    None when the header is missing. Raises ValueError for tags this API never issues.
+    """
+    headers = event.get('headers') or {}
+    value = next((value for name, value in headers.items() if name.lower() == 'if-match'), None)
+    if value is None or not value.strip():
+        return None
+    value = value.strip()
+    if value == ANY_VERSION:
+        return ANY_VERSION
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+    if not value.isdigit():
+        raise ValueError('If-Match must be an ETag returned by this API, e.g. "3"')
+    return int(value)
+
+
+def build_update(key, changes, expected_version, condition=None, names=None, values=None):
+    """
+    update_item kwargs writing only `changes` (attribute -> value, None removes
+    the attribute) and incrementing the version, conditional on the item
+    existing at `expected_version` (ANY_VERSION skips the check) and on the
+    optional extra `condition`, whose placeholders come from `names`/`values`.
+    """
+    key_name = next(iter(key))
+    names = {'#key': key_name, '#version': VERSION_ATTRIBUTE, **(names or {})}
+    values = {':zero': 0, ':one': 1, **(values or {})}
+
+    sets = ['#version = if_not_exists(#version, :zero) + :one']
+    removes = []
+    for i, (attribute, value) in enumerate(changes.items()):
+        names[f'#f{i}'] = attribute
+        if value is None:
+            removes.append(f'#f{i}')
+        else:
+            values[f':f{i}'] = value
+            sets.append(f'#f{i} = :f{i}')
+    update_expression = 'SET ' + ', '.join(sets)
+    if removes:
+        update_expression += ' REMOVE ' + ', '.join(removes)
+
+    conditions = ['attribute_exists(#key)']
+    if expected_version == 0:
+        conditions.append('attribute_not_exists(#version)')
+    elif expected_version != ANY_VERSION:
+        values[':expected_version'] = expected_version
+        conditions.append('#version = :expected_version')
+    if condition:
+        conditions.append(f'({condition})')
+
+    return {
+        'Key': key,
+        'UpdateExpression': update_expression,
+        'ConditionExpression': ' AND '.join(conditions),
+        'ExpressionAttributeNames': names,
+        'ExpressionAttributeValues': values,
+        'ReturnValues': 'ALL_NEW',
+        # Lets callers tell a missing item, a stale version and a failed extra condition apart without a read
+        'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+    }
+
+
+def failed_item(error):
+    """The current item attached to a ConditionalCheckFailedException, or None if it does not exist"""
+    item = error.response.get('Item')
+    if not item:
+        return None
+    return {name: _deserializer.deserialize(value) for name, value in item.items()}
+
+
+def version_matches(item, expected_version):
+    return expected_version == ANY_VERSION or int(item.get(VERSION_ATTRIBUTE, 0)) == expected_version
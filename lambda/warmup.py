@@ -0,0 +1,96 @@
+"""
+Warm-up pings for the Lambda handlers.
+
+The warmup_* EventBridge rules in main.tf invoke the API functions on a
+schedule with {"warmup": true}. Handlers wrapped in @warm answer that ping
+without running the request path. Instead they open the DynamoDB connection
+and load the service models by describing their tables, and run their preload
+hooks, so the next real request starts from a warm container with warm caches.
+
+Every container also logs one line with its init time, from process start to
+the first invocation, and whether a warm-up ping or a real request paid for it.
+"""
+import functools
+import json
+import os
+import time
+
+_imported_at = time.time()
+_cold = True
+
+
+def _process_started_at():
+    """Wall clock time the runtime process started, or the import of this module off Linux"""
+    try:
+        with open('/proc/self/stat') as f:
+            # The command name may contain spaces, so count fields after its closing parenthesis
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - uptime + start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return _imported_at
+
+
+_process_started = _process_started_at()
+
+
+def is_warmup(event):
+    return isinstance(event, dict) and event.get('warmup') is True
+
+
+def _prime(tables, preload, event):
+    timings = {}
+    for table in tables:
+        started = time.perf_counter()
+        try:
+            # DescribeTable costs no capacity but still sets up TLS and the resource models
+            table.load()
+        except Exception as e:
+            print(f"Warm-up could not describe {table.name}: {str(e)}")
+        timings[table.name] = round((time.perf_counter() - started) * 1000, 1)
+    for hook in preload:
+        started = time.perf_counter()
+        try:
+            hook(event)
+        except Exception as e:
+            print(f"Warm-up preload {hook.__name__} failed: {str(e)}")
+        timings[hook.__name__] = round((time.perf_counter() - started) * 1000, 1)
+    return timings
+
+
+def warm(tables=(), preload=()):
+    """
+    Decorator answering warm-up pings for a handler. `tables` are the boto3
+    Table resources it uses; `preload` are callables taking the ping event that
+    fill the handler's caches. Apply it outermost, above @validated/@idempotent.
+    """
+    def decorator(handler):
+        initialized = time.time()
+
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            global _cold
+            cold, _cold = _cold, False
+            if cold:
+                print(json.dumps({
+                    'message': 'cold start',
+                    'handler': handler.__module__,
+                    'init_ms': round((initialized - _process_started) * 1000, 1),
+                    'idle_before_first_invocation_ms': round((time.time() - initialized) * 1000, 1),
+                    'warmup': is_warmup(event)
+                }))
+
+            if not is_warmup(event):
+                return handler(event, context)
+
+            started = time.perf_counter()
+            timings = _prime(tables, preload, event)
+            return {
+                'warmup': True,
+                'cold_start': cold,
+                'prime_ms': round((time.perf_counter() - started) * 1000, 1),
+                'timings_ms': timings
+            }
+        return wrapper
+    return decorator
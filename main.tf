@@ -22,6 +22,43 @@ variable "jwt_secret" {
   sensitive   = true
 }
 
+variable "archive_retention_days" {
+  description = "Days after date_end before an event and its descendants move to the archive"
+  type        = number
+  default     = 180
+}
+
+variable "archive_schedule" {
+  description = "Schedule expression for the event archival sweep"
+  type        = string
+  default     = "rate(1 day)"
+}
+
+variable "warmup_enabled" {
+  description = "Ping the API functions on a schedule so requests rarely land on a cold container"
+  type        = bool
+  default     = true
+}
+
+variable "warmup_schedule" {
+  description = "Schedule expression for the warm-up pings"
+  type        = string
+  default     = "rate(5 minutes)"
+}
+
+variable "profile_secret" {
+  description = "HMAC key for X-Profile request profiling tokens; empty disables header-triggered profiling"
+  type        = string
+  default     = ""
+  sensitive   = true
+}
+
+variable "profile_sample_rate" {
+  description = "Share of requests profiled at random (0 disables sampling)"
+  type        = number
+  default     = 0
+}
+
 # --------------------
 # DynamoDB Table for User Information
 # --------------------
@@ -98,6 +135,8 @@ resource "aws_dynamodb_table" "events_table" {
   name           = "${var.project_name}-events"
   billing_mode   = "PAY_PER_REQUEST"
   hash_key       = "id"
+  stream_enabled   = true
+  stream_view_type = "NEW_AND_OLD_IMAGES"
 
   attribute {
     name = "id"
@@ -127,6 +166,10 @@ resource "aws_dynamodb_table" "events_table" {
     name = "parent_event_id"
     type = "S"
   }
+  attribute {
+    name = "archive_key"
+    type = "S"
+  }
 
   global_secondary_index {
     name            = "name-index"
@@ -164,6 +207,14 @@ resource "aws_dynamodb_table" "events_table" {
     projection_type = "ALL"
   }
 
+  # Sparse: only root events carry archive_key, and only those with a date_end are indexed
+  global_secondary_index {
+    name            = "archive_key-date_end-index"
+    hash_key        = "archive_key"
+    range_key       = "date_end"
+    projection_type = "KEYS_ONLY"
+  }
+
   tags = {
     Name        = "Events Table"
     Environment = "dev"
@@ -177,6 +228,8 @@ resource "aws_dynamodb_table" "teams_table" {
   name           = "${var.project_name}-teams"
   billing_mode   = "PAY_PER_REQUEST"
   hash_key       = "id"
+  stream_enabled   = true
+  stream_view_type = "NEW_AND_OLD_IMAGES"
 
   attribute {
     name = "id"
@@ -227,6 +280,8 @@ resource "aws_dynamodb_table" "event_registrations_table" {
   billing_mode   = "PAY_PER_REQUEST"
   hash_key       = "event_id"
   range_key      = "team_id"
+  stream_enabled   = true
+  stream_view_type = "NEW_AND_OLD_IMAGES"
 
   attribute {
     name = "event_id"
@@ -269,6 +324,163 @@ resource "aws_dynamodb_table" "event_registrations_table" {
   }
 }
 
+# --------------------
+# DynamoDB Table for Matches (fixtures generated per event)
+# --------------------
+resource "aws_dynamodb_table" "matches_table" {
+  name           = "${var.project_name}-matches"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "event_id"
+  range_key      = "match_id"
+
+  attribute {
+    name = "event_id"
+    type = "S"
+  }
+  attribute {
+    name = "match_id"
+    type = "S"
+  }
+
+  tags = {
+    Name        = "Matches Table"
+    Environment = "dev"
+  }
+}
+
+# --------------------
+# DynamoDB Table for Standings (one row per team per event)
+# --------------------
+resource "aws_dynamodb_table" "standings_table" {
+  name           = "${var.project_name}-standings"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "event_id"
+  range_key      = "team_id"
+
+  attribute {
+    name = "event_id"
+    type = "S"
+  }
+  attribute {
+    name = "team_id"
+    type = "S"
+  }
+
+  tags = {
+    Name        = "Standings Table"
+    Environment = "dev"
+  }
+}
+
+# --------------------
+# DynamoDB Table for Precomputed Summaries (maintained from table streams)
+# --------------------
+resource "aws_dynamodb_table" "summaries_table" {
+  name           = "${var.project_name}-summaries"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "summary_id"
+
+  attribute {
+    name = "summary_id"
+    type = "S"
+  }
+
+  # Expires the applied-record ledger entries
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = "Summaries Table"
+    Environment = "dev"
+  }
+}
+
+# --------------------
+# DynamoDB Table for Idempotency Keys
+# --------------------
+resource "aws_dynamodb_table" "idempotency_table" {
+  name           = "${var.project_name}-idempotency"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "idempotency_key"
+
+  attribute {
+    name = "idempotency_key"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = "Idempotency Table"
+    Environment = "dev"
+  }
+}
+
+# --------------------
+# Archive for Finished Events
+# --------------------
+resource "aws_s3_bucket" "archive_bucket" {
+  bucket_prefix = "${var.project_name}-archive-"
+
+  tags = {
+    Name        = "Event Archive Bucket"
+    Environment = "dev"
+  }
+}
+
+resource "aws_s3_bucket_public_access_block" "archive_bucket" {
+  bucket                  = aws_s3_bucket.archive_bucket.id
+  block_public_acls       = true
+  block_public_policy     = true
+  ignore_public_acls      = true
+  restrict_public_buckets = true
+}
+
+resource "aws_dynamodb_table" "archive_index_table" {
+  name           = "${var.project_name}-archive-index"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "event_id"
+
+  attribute {
+    name = "event_id"
+    type = "S"
+  }
+
+  tags = {
+    Name        = "Archive Index Table"
+    Environment = "dev"
+  }
+}
+
+# --------------------
+# DynamoDB Table for Sign-in/Sign-up Rate Limits
+# --------------------
+resource "aws_dynamodb_table" "rate_limits_table" {
+  name           = "${var.project_name}-rate-limits"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "limit_key"
+
+  attribute {
+    name = "limit_key"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = "Rate Limits Table"
+    Environment = "dev"
+  }
+}
+
 # --------------------
 # IAM Roles & Policies
 # --------------------
@@ -298,22 +510,55 @@ resource "aws_iam_role_policy" "lambda_permissions" {
           "dynamodb:PutItem",
           "dynamodb:GetItem",
           "dynamodb:BatchGetItem",
+          "dynamodb:BatchWriteItem",
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
           "dynamodb:Query",
-          "dynamodb:Scan"
+          "dynamodb:Scan",
+          "dynamodb:DescribeTable"
         ],
         Resource = [
           aws_dynamodb_table.user_table.arn,
           aws_dynamodb_table.events_table.arn,
           aws_dynamodb_table.teams_table.arn,
           aws_dynamodb_table.event_registrations_table.arn,
+          aws_dynamodb_table.matches_table.arn,
+          aws_dynamodb_table.standings_table.arn,
+          aws_dynamodb_table.summaries_table.arn,
+          aws_dynamodb_table.idempotency_table.arn,
+          aws_dynamodb_table.rate_limits_table.arn,
+          aws_dynamodb_table.archive_index_table.arn,
           "${aws_dynamodb_table.user_table.arn}/index/*",
           "${aws_dynamodb_table.events_table.arn}/index/*",
           "${aws_dynamodb_table.teams_table.arn}/index/*",
           "${aws_dynamodb_table.event_registrations_table.arn}/index/*"
         ]
       },
+      {
+        Effect   = "Allow",
+        Action   = [
+          "dynamodb:DescribeStream",
+          "dynamodb:GetRecords",
+          "dynamodb:GetShardIterator",
+          "dynamodb:ListStreams"
+        ],
+        Resource = [
+          aws_dynamodb_table.events_table.stream_arn,
+          aws_dynamodb_table.teams_table.stream_arn,
+          aws_dynamodb_table.event_registrations_table.stream_arn
+        ]
+      },
+      {
+        Effect   = "Allow",
+        Action   = ["s3:GetObject", "s3:PutObject"],
+        Resource = ["${aws_s3_bucket.archive_bucket.arn}/*"]
+      },
+      {
+        # Lets GetObject on a missing key return NoSuchKey instead of AccessDenied
+        Effect   = "Allow",
+        Action   = ["s3:ListBucket"],
+        Resource = [aws_s3_bucket.archive_bucket.arn]
+      },
       {
         Effect   = "Allow",
         Action   = ["logs:CreateLogGroup", "logs:CreateLogStream", "logs:PutLogEvents"],
@@ -340,6 +585,10 @@ resource "aws_lambda_function" "create_user" {
   environment {
     variables = {
       USER_TABLE = aws_dynamodb_table.user_table.name
+      IDEMPOTENCY_TABLE = aws_dynamodb_table.idempotency_table.name
+      RATE_LIMIT_TABLE = aws_dynamodb_table.rate_limits_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
     }
   }
 
@@ -363,6 +612,9 @@ resource "aws_lambda_function" "signin_user" {
     variables = {
       USER_TABLE = aws_dynamodb_table.user_table.name
       JWT_SECRET = var.jwt_secret
+      RATE_LIMIT_TABLE = aws_dynamodb_table.rate_limits_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
     }
   }
 
@@ -389,6 +641,9 @@ resource "aws_lambda_function" "create_event" {
     variables = {
       USER_TABLE = aws_dynamodb_table.user_table.name
       EVENTS_TABLE = aws_dynamodb_table.events_table.name
+      IDEMPOTENCY_TABLE = aws_dynamodb_table.idempotency_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
     }
   }
 
@@ -412,6 +667,12 @@ resource "aws_lambda_function" "get_event" {
     variables = {
       USER_TABLE = aws_dynamodb_table.user_table.name
       EVENTS_TABLE = aws_dynamodb_table.events_table.name
+      TEAMS_TABLE = aws_dynamodb_table.teams_table.name
+      EVENT_REGISTRATIONS_TABLE = aws_dynamodb_table.event_registrations_table.name
+      ARCHIVE_INDEX_TABLE = aws_dynamodb_table.archive_index_table.name
+      ARCHIVE_BUCKET = aws_s3_bucket.archive_bucket.id
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
     }
   }
 
@@ -435,6 +696,8 @@ resource "aws_lambda_function" "delete_event" {
     variables = {
       USER_TABLE = aws_dynamodb_table.user_table.name
       EVENTS_TABLE = aws_dynamodb_table.events_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
     }
   }
 
@@ -443,6 +706,30 @@ resource "aws_lambda_function" "delete_event" {
   }
 }
 
+resource "aws_lambda_function" "update_event" {
+  function_name = "${var.project_name}-update-event"
+  role          = aws_iam_role.lambda_exec_role.arn
+  runtime       = "python3.9"
+  handler       = "update_event.lambda_handler"
+  timeout       = 30
+  memory_size   = 512
+
+  filename         = "lambda/update_event.zip"
+  source_code_hash = filebase64sha256("lambda/update_event.zip")
+
+  environment {
+    variables = {
+      EVENTS_TABLE = aws_dynamodb_table.events_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+    }
+  }
+
+  tags = {
+    Name = "Update Event Lambda"
+  }
+}
+
 resource "aws_lambda_function" "get_events_for_organizer" {
   function_name = "${var.project_name}-get-events-for-organizer"
   role          = aws_iam_role.lambda_exec_role.arn
@@ -465,6 +752,157 @@ resource "aws_lambda_function" "get_events_for_organizer" {
   }
 }
 
+resource "aws_lambda_function" "generate_fixtures" {
+  function_name = "${var.project_name}-generate-fixtures"
+  role          = aws_iam_role.lambda_exec_role.arn
+  runtime       = "python3.9"
+  handler       = "generate_fixtures.lambda_handler"
+  timeout       = 30
+  memory_size   = 1024
+
+  filename         = "lambda/generate_fixtures.zip"
+  source_code_hash = filebase64sha256("lambda/generate_fixtures.zip")
+
+  environment {
+    variables = {
+      EVENTS_TABLE = aws_dynamodb_table.events_table.name
+      EVENT_REGISTRATIONS_TABLE = aws_dynamodb_table.event_registrations_table.name
+      MATCHES_TABLE = aws_dynamodb_table.matches_table.name
+      STANDINGS_TABLE = aws_dynamodb_table.standings_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+    }
+  }
+
+  tags = {
+    Name = "Generate Fixtures Lambda"
+  }
+}
+
+resource "aws_lambda_function" "submit_result" {
+  function_name = "${var.project_name}-submit-result"
+  role          = aws_iam_role.lambda_exec_role.arn
+  runtime       = "python3.9"
+  handler       = "submit_result.lambda_handler"
+  timeout       = 30
+  memory_size   = 512
+
+  filename         = "lambda/submit_result.zip"
+  source_code_hash = filebase64sha256("lambda/submit_result.zip")
+
+  environment {
+    variables = {
+      EVENTS_TABLE = aws_dynamodb_table.events_table.name
+      MATCHES_TABLE = aws_dynamodb_table.matches_table.name
+      STANDINGS_TABLE = aws_dynamodb_table.standings_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+    }
+  }
+
+  tags = {
+    Name = "Submit Result Lambda"
+  }
+}
+
+resource "aws_lambda_function" "get_standings" {
+  function_name = "${var.project_name}-get-standings"
+  role          = aws_iam_role.lambda_exec_role.arn
+  runtime       = "python3.9"
+  handler       = "get_standings.lambda_handler"
+  timeout       = 30
+  memory_size   = 512
+
+  filename         = "lambda/get_standings.zip"
+  source_code_hash = filebase64sha256("lambda/get_standings.zip")
+
+  environment {
+    variables = {
+      STANDINGS_TABLE = aws_dynamodb_table.standings_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+    }
+  }
+
+  tags = {
+    Name = "Get Standings Lambda"
+  }
+}
+
+resource "aws_lambda_function" "rebuild_standings" {
+  function_name = "${var.project_name}-rebuild-standings"
+  role          = aws_iam_role.lambda_exec_role.arn
+  runtime       = "python3.9"
+  handler       = "rebuild_standings.lambda_handler"
+  timeout       = 300
+  memory_size   = 512
+
+  filename         = "lambda/rebuild_standings.zip"
+  source_code_hash = filebase64sha256("lambda/rebuild_standings.zip")
+
+  environment {
+    variables = {
+      MATCHES_TABLE = aws_dynamodb_table.matches_table.name
+      STANDINGS_TABLE = aws_dynamodb_table.standings_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+    }
+  }
+
+  tags = {
+    Name = "Rebuild Standings Lambda"
+  }
+}
+
+resource "aws_lambda_function" "archive_events" {
+  function_name = "${var.project_name}-archive-events"
+  role          = aws_iam_role.lambda_exec_role.arn
+  runtime       = "python3.9"
+  handler       = "archive_events.lambda_handler"
+  timeout       = 300
+  memory_size   = 1024
+
+  filename         = "lambda/archive_events.zip"
+  source_code_hash = filebase64sha256("lambda/archive_events.zip")
+
+  environment {
+    variables = {
+      EVENTS_TABLE = aws_dynamodb_table.events_table.name
+      EVENT_REGISTRATIONS_TABLE = aws_dynamodb_table.event_registrations_table.name
+      MATCHES_TABLE = aws_dynamodb_table.matches_table.name
+      STANDINGS_TABLE = aws_dynamodb_table.standings_table.name
+      ARCHIVE_INDEX_TABLE = aws_dynamodb_table.archive_index_table.name
+      ARCHIVE_BUCKET = aws_s3_bucket.archive_bucket.id
+      ARCHIVE_RETENTION_DAYS = var.archive_retention_days
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+    }
+  }
+
+  tags = {
+    Name = "Archive Events Lambda"
+  }
+}
+
+resource "aws_cloudwatch_event_rule" "archive_events_schedule" {
+  name                = "${var.project_name}-archive-events"
+  description         = "Move finished events to the archive"
+  schedule_expression = var.archive_schedule
+}
+
+resource "aws_cloudwatch_event_target" "archive_events_target" {
+  rule = aws_cloudwatch_event_rule.archive_events_schedule.name
+  arn  = aws_lambda_function.archive_events.arn
+}
+
+resource "aws_lambda_permission" "allow_events_archive_events" {
+  statement_id  = "AllowExecutionFromEventBridgeArchiveEvents"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.archive_events.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.archive_events_schedule.arn
+}
+
 # --------------------
 # Lambda Functions for Team Management
 # --------------------
@@ -483,6 +921,9 @@ resource "aws_lambda_function" "create_team" {
     variables = {
       USER_TABLE = aws_dynamodb_table.user_table.name
       TEAMS_TABLE = aws_dynamodb_table.teams_table.name
+      IDEMPOTENCY_TABLE = aws_dynamodb_table.idempotency_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
     }
   }
 
@@ -506,6 +947,8 @@ resource "aws_lambda_function" "get_team" {
     variables = {
       USER_TABLE = aws_dynamodb_table.user_table.name
       TEAMS_TABLE = aws_dynamodb_table.teams_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
     }
   }
 
@@ -529,6 +972,8 @@ resource "aws_lambda_function" "delete_team" {
     variables = {
       USER_TABLE = aws_dynamodb_table.user_table.name
       TEAMS_TABLE = aws_dynamodb_table.teams_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
     }
   }
 
@@ -537,6 +982,30 @@ resource "aws_lambda_function" "delete_team" {
   }
 }
 
+resource "aws_lambda_function" "update_team" {
+  function_name = "${var.project_name}-update-team"
+  role          = aws_iam_role.lambda_exec_role.arn
+  runtime       = "python3.9"
+  handler       = "update_team.lambda_handler"
+  timeout       = 30
+  memory_size   = 512
+
+  filename         = "lambda/update_team.zip"
+  source_code_hash = filebase64sha256("lambda/update_team.zip")
+
+  environment {
+    variables = {
+      TEAMS_TABLE = aws_dynamodb_table.teams_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+    }
+  }
+
+  tags = {
+    Name = "Update Team Lambda"
+  }
+}
+
 resource "aws_lambda_function" "get_teams_for_user" {
   function_name = "${var.project_name}-get-teams-for-user"
   role          = aws_iam_role.lambda_exec_role.arn
@@ -551,6 +1020,8 @@ resource "aws_lambda_function" "get_teams_for_user" {
   environment {
     variables = {
       TEAMS_TABLE = aws_dynamodb_table.teams_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
     }
   }
 
@@ -559,6 +1030,74 @@ resource "aws_lambda_function" "get_teams_for_user" {
   }
 }
 
+# --------------------
+# Lambda Functions for Precomputed Summaries
+# --------------------
+resource "aws_lambda_function" "stream_counters" {
+  function_name = "${var.project_name}-stream-counters"
+  role          = aws_iam_role.lambda_exec_role.arn
+  runtime       = "python3.9"
+  handler       = "stream_counters.lambda_handler"
+  timeout       = 60
+  memory_size   = 512
+
+  filename         = "lambda/stream_counters.zip"
+  source_code_hash = filebase64sha256("lambda/stream_counters.zip")
+
+  environment {
+    variables = {
+      EVENTS_TABLE = aws_dynamodb_table.events_table.name
+      TEAMS_TABLE = aws_dynamodb_table.teams_table.name
+      EVENT_REGISTRATIONS_TABLE = aws_dynamodb_table.event_registrations_table.name
+      SUMMARIES_TABLE = aws_dynamodb_table.summaries_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+    }
+  }
+
+  tags = {
+    Name = "Stream Counters Lambda"
+  }
+}
+
+resource "aws_lambda_event_source_mapping" "stream_counters_sources" {
+  for_each = {
+    events        = aws_dynamodb_table.events_table.stream_arn
+    teams         = aws_dynamodb_table.teams_table.stream_arn
+    registrations = aws_dynamodb_table.event_registrations_table.stream_arn
+  }
+
+  event_source_arn        = each.value
+  function_name           = aws_lambda_function.stream_counters.arn
+  starting_position       = "LATEST"
+  batch_size              = 100
+  function_response_types = ["ReportBatchItemFailures"]
+}
+
+resource "aws_lambda_function" "get_summary" {
+  function_name = "${var.project_name}-get-summary"
+  role          = aws_iam_role.lambda_exec_role.arn
+  runtime       = "python3.9"
+  handler       = "get_summary.lambda_handler"
+  timeout       = 30
+  memory_size   = 512
+
+  filename         = "lambda/get_summary.zip"
+  source_code_hash = filebase64sha256("lambda/get_summary.zip")
+
+  environment {
+    variables = {
+      SUMMARIES_TABLE = aws_dynamodb_table.summaries_table.name
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+    }
+  }
+
+  tags = {
+    Name = "Get Summary Lambda"
+  }
+}
+
 # --------------------
 # Lambda Function: Endpoints Dashboard
 # --------------------
@@ -573,6 +1112,13 @@ resource "aws_lambda_function" "endpoints_dashboard" {
   filename         = "lambda/endpoints_dashboard.zip"
   source_code_hash = filebase64sha256("lambda/endpoints_dashboard.zip")
 
+  environment {
+    variables = {
+      PROFILE_SECRET = var.profile_secret
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+    }
+  }
+
   tags = {
     Name = "Endpoints Dashboard Lambda"
   }
@@ -588,10 +1134,10 @@ resource "aws_apigatewayv2_api" "api" {
 
   cors_configuration {
     allow_credentials = false
-    allow_headers     = ["content-type", "x-amz-date", "authorization", "x-api-key", "x-amz-security-token", "x-amz-user-agent", "x-requested-with"]
-    allow_methods     = ["GET", "HEAD", "OPTIONS", "POST", "PUT", "DELETE"]
+    allow_headers     = ["content-type", "x-amz-date", "authorization", "x-api-key", "x-amz-security-token", "x-amz-user-agent", "x-requested-with", "idempotency-key", "if-match", "x-profile"]
+    allow_methods     = ["GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE"]
     allow_origins     = ["*"]
-    expose_headers    = ["x-amz-request-id", "x-amz-id-2"]
+    expose_headers    = ["x-amz-request-id", "x-amz-id-2", "etag", "retry-after"]
     max_age          = 86400
   }
 
@@ -726,6 +1272,28 @@ resource "aws_lambda_permission" "allow_apigw_delete_event" {
   source_arn    = "${aws_apigatewayv2_api.api.execution_arn}/*/*"
 }
 
+resource "aws_apigatewayv2_integration" "update_event_integration" {
+  api_id             = aws_apigatewayv2_api.api.id
+  integration_type   = "AWS_PROXY"
+  integration_uri    = aws_lambda_function.update_event.invoke_arn
+  integration_method = "POST"
+  payload_format_version = "2.0"
+}
+
+resource "aws_apigatewayv2_route" "update_event_route" {
+  api_id    = aws_apigatewayv2_api.api.id
+  route_key = "PATCH /event/{eventId}"
+  target    = "integrations/${aws_apigatewayv2_integration.update_event_integration.id}"
+}
+
+resource "aws_lambda_permission" "allow_apigw_update_event" {
+  statement_id  = "AllowExecutionFromAPIGWUpdateEvent"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.update_event.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.api.execution_arn}/*/*"
+}
+
 resource "aws_apigatewayv2_integration" "get_events_for_organizer_integration" {
   api_id             = aws_apigatewayv2_api.api.id
   integration_type   = "AWS_PROXY"
@@ -748,6 +1316,72 @@ resource "aws_lambda_permission" "allow_apigw_get_events_for_organizer" {
   source_arn    = "${aws_apigatewayv2_api.api.execution_arn}/*/*"
 }
 
+resource "aws_apigatewayv2_integration" "generate_fixtures_integration" {
+  api_id             = aws_apigatewayv2_api.api.id
+  integration_type   = "AWS_PROXY"
+  integration_uri    = aws_lambda_function.generate_fixtures.invoke_arn
+  integration_method = "POST"
+  payload_format_version = "2.0"
+}
+
+resource "aws_apigatewayv2_route" "generate_fixtures_route" {
+  api_id    = aws_apigatewayv2_api.api.id
+  route_key = "POST /event/{eventId}/fixtures"
+  target    = "integrations/${aws_apigatewayv2_integration.generate_fixtures_integration.id}"
+}
+
+resource "aws_lambda_permission" "allow_apigw_generate_fixtures" {
+  statement_id  = "AllowExecutionFromAPIGWGenerateFixtures"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.generate_fixtures.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.api.execution_arn}/*/*"
+}
+
+resource "aws_apigatewayv2_integration" "submit_result_integration" {
+  api_id             = aws_apigatewayv2_api.api.id
+  integration_type   = "AWS_PROXY"
+  integration_uri    = aws_lambda_function.submit_result.invoke_arn
+  integration_method = "POST"
+  payload_format_version = "2.0"
+}
+
+resource "aws_apigatewayv2_route" "submit_result_route" {
+  api_id    = aws_apigatewayv2_api.api.id
+  route_key = "POST /event/{eventId}/matches/{matchId}/result"
+  target    = "integrations/${aws_apigatewayv2_integration.submit_result_integration.id}"
+}
+
+resource "aws_lambda_permission" "allow_apigw_submit_result" {
+  statement_id  = "AllowExecutionFromAPIGWSubmitResult"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.submit_result.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.api.execution_arn}/*/*"
+}
+
+resource "aws_apigatewayv2_integration" "get_standings_integration" {
+  api_id             = aws_apigatewayv2_api.api.id
+  integration_type   = "AWS_PROXY"
+  integration_uri    = aws_lambda_function.get_standings.invoke_arn
+  integration_method = "POST"
+  payload_format_version = "2.0"
+}
+
+resource "aws_apigatewayv2_route" "get_standings_route" {
+  api_id    = aws_apigatewayv2_api.api.id
+  route_key = "GET /event/{eventId}/standings"
+  target    = "integrations/${aws_apigatewayv2_integration.get_standings_integration.id}"
+}
+
+resource "aws_lambda_permission" "allow_apigw_get_standings" {
+  statement_id  = "AllowExecutionFromAPIGWGetStandings"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.get_standings.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.api.execution_arn}/*/*"
+}
+
 # --------------------
 # API Gateway Integrations and Routes for Team Management
 # --------------------
@@ -817,6 +1451,28 @@ resource "aws_lambda_permission" "allow_apigw_delete_team" {
   source_arn    = "${aws_apigatewayv2_api.api.execution_arn}/*/*"
 }
 
+resource "aws_apigatewayv2_integration" "update_team_integration" {
+  api_id             = aws_apigatewayv2_api.api.id
+  integration_type   = "AWS_PROXY"
+  integration_uri    = aws_lambda_function.update_team.invoke_arn
+  integration_method = "POST"
+  payload_format_version = "2.0"
+}
+
+resource "aws_apigatewayv2_route" "update_team_route" {
+  api_id    = aws_apigatewayv2_api.api.id
+  route_key = "PATCH /team/{teamId}"
+  target    = "integrations/${aws_apigatewayv2_integration.update_team_integration.id}"
+}
+
+resource "aws_lambda_permission" "allow_apigw_update_team" {
+  statement_id  = "AllowExecutionFromAPIGWUpdateTeam"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.update_team.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.api.execution_arn}/*/*"
+}
+
 resource "aws_apigatewayv2_integration" "get_teams_for_user_integration" {
   api_id             = aws_apigatewayv2_api.api.id
   integration_type   = "AWS_PROXY"
@@ -839,6 +1495,43 @@ resource "aws_lambda_permission" "allow_apigw_get_teams_for_user" {
   source_arn    = "${aws_apigatewayv2_api.api.execution_arn}/*/*"
 }
 
+# --------------------
+# API Gateway Integration and Routes for Summaries
+# --------------------
+resource "aws_apigatewayv2_integration" "get_summary_integration" {
+  api_id             = aws_apigatewayv2_api.api.id
+  integration_type   = "AWS_PROXY"
+  integration_uri    = aws_lambda_function.get_summary.invoke_arn
+  integration_method = "POST"
+  payload_format_version = "2.0"
+}
+
+resource "aws_apigatewayv2_route" "get_summary_route" {
+  api_id    = aws_apigatewayv2_api.api.id
+  route_key = "GET /user/{userId}/summary"
+  target    = "integrations/${aws_apigatewayv2_integration.get_summary_integration.id}"
+}
+
+resource "aws_lambda_permission" "allow_apigw_get_summary" {
+  statement_id  = "AllowExecutionFromAPIGWGetSummary"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.get_summary.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.api.execution_arn}/*/*"
+}
+
+resource "aws_apigatewayv2_route" "get_team_summary_route" {
+  api_id    = aws_apigatewayv2_api.api.id
+  route_key = "GET /team/{teamId}/summary"
+  target    = "integrations/${aws_apigatewayv2_integration.get_summary_integration.id}"
+}
+
+resource "aws_apigatewayv2_route" "get_event_summary_route" {
+  api_id    = aws_apigatewayv2_api.api.id
+  route_key = "GET /event/{eventId}/summary"
+  target    = "integrations/${aws_apigatewayv2_integration.get_summary_integration.id}"
+}
+
 # --------------------
 # API Gateway Integration and Route for Endpoints Dashboard
 # --------------------
@@ -864,6 +1557,61 @@ resource "aws_lambda_permission" "allow_apigw_endpoints_dashboard" {
   source_arn    = "${aws_apigatewayv2_api.api.execution_arn}/*/*"
 }
 
+# --------------------
+# Scheduled Warm-up Pings for the API Functions
+# --------------------
+locals {
+  warmup_functions = var.warmup_enabled ? {
+    create_user         = aws_lambda_function.create_user
+    signin_user         = aws_lambda_function.signin_user
+    create_event        = aws_lambda_function.create_event
+    get_event           = aws_lambda_function.get_event
+    update_event        = aws_lambda_function.update_event
+    delete_event        = aws_lambda_function.delete_event
+    generate_fixtures   = aws_lambda_function.generate_fixtures
+    submit_result       = aws_lambda_function.submit_result
+    get_standings       = aws_lambda_function.get_standings
+    create_team         = aws_lambda_function.create_team
+    get_team            = aws_lambda_function.get_team
+    update_team         = aws_lambda_function.update_team
+    delete_team         = aws_lambda_function.delete_team
+    get_teams_for_user  = aws_lambda_function.get_teams_for_user
+    get_summary         = aws_lambda_function.get_summary
+    endpoints_dashboard = aws_lambda_function.endpoints_dashboard
+  } : {}
+}
+
+# A rule takes at most 5 targets, so every function gets its own
+resource "aws_cloudwatch_event_rule" "warmup" {
+  for_each            = local.warmup_functions
+  name                = "${var.project_name}-warmup-${replace(each.key, "_", "-")}"
+  description         = "Keep the ${each.key} Lambda warm"
+  schedule_expression = var.warmup_schedule
+}
+
+resource "aws_cloudwatch_event_target" "warmup" {
+  for_each = local.warmup_functions
+  rule     = aws_cloudwatch_event_rule.warmup[each.key].name
+  arn      = each.value.arn
+  # requestContext lets handlers preload caches keyed by the API URL (endpoints_dashboard)
+  input = jsonencode({
+    warmup = true
+    requestContext = {
+      domainName = replace(aws_apigatewayv2_api.api.api_endpoint, "https://", "")
+      stage      = aws_apigatewayv2_stage.api_stage.name
+    }
+  })
+}
+
+resource "aws_lambda_permission" "allow_events_warmup" {
+  for_each      = local.warmup_functions
+  statement_id  = "AllowExecutionFromEventBridgeWarmup"
+  action        = "lambda:InvokeFunction"
+  function_name = each.value.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.warmup[each.key].arn
+}
+
 # --------------------
 # Outputs
 # --------------------
@@ -892,6 +1640,41 @@ output "event_registrations_table_name" {
   value       = aws_dynamodb_table.event_registrations_table.name
 }
 
+output "matches_table_name" {
+  description = "Name of the matches DynamoDB table"
+  value       = aws_dynamodb_table.matches_table.name
+}
+
+output "standings_table_name" {
+  description = "Name of the standings DynamoDB table"
+  value       = aws_dynamodb_table.standings_table.name
+}
+
+output "summaries_table_name" {
+  description = "Name of the precomputed summaries DynamoDB table"
+  value       = aws_dynamodb_table.summaries_table.name
+}
+
+output "archive_index_table_name" {
+  description = "Name of the archived events index DynamoDB table"
+  value       = aws_dynamodb_table.archive_index_table.name
+}
+
+output "archive_bucket_name" {
+  description = "Name of the S3 bucket holding archived events"
+  value       = aws_s3_bucket.archive_bucket.id
+}
+
+output "idempotency_table_name" {
+  description = "Name of the idempotency keys DynamoDB table"
+  value       = aws_dynamodb_table.idempotency_table.name
+}
+
+output "rate_limits_table_name" {
+  description = "Name of the sign-in/sign-up rate limits DynamoDB table"
+  value       = aws_dynamodb_table.rate_limits_table.name
+}
+
 output "endpoints_dashboard_url" {
   description = "Endpoints Dashboard URL"
   value       = "${aws_apigatewayv2_stage.api_stage.invoke_url}/endpoints"
@@ -912,6 +1695,10 @@ output "api_endpoints" {
       get_event = "${aws_apigatewayv2_stage.api_stage.invoke_url}/event/{eventId}"
       update_event = "${aws_apigatewayv2_stage.api_stage.invoke_url}/event/{eventId}"
       delete_event = "${aws_apigatewayv2_stage.api_stage.invoke_url}/event/{eventId}"
+      update_event = "${aws_apigatewayv2_stage.api_stage.invoke_url}/event/{eventId}"
+      generate_fixtures = "${aws_apigatewayv2_stage.api_stage.invoke_url}/event/{eventId}/fixtures"
+      submit_result = "${aws_apigatewayv2_stage.api_stage.invoke_url}/event/{eventId}/matches/{matchId}/result"
+      get_standings = "${aws_apigatewayv2_stage.api_stage.invoke_url}/event/{eventId}/standings"
     }
     team_endpoints = {
       get_all_teams = "${aws_apigatewayv2_stage.api_stage.invoke_url}/teams/all"
@@ -920,9 +1707,15 @@ output "api_endpoints" {
       get_team = "${aws_apigatewayv2_stage.api_stage.invoke_url}/team/{teamId}"
       update_team = "${aws_apigatewayv2_stage.api_stage.invoke_url}/team/{teamId}"
       delete_team = "${aws_apigatewayv2_stage.api_stage.invoke_url}/team/{teamId}"
+      update_team = "${aws_apigatewayv2_stage.api_stage.invoke_url}/team/{teamId}"
       add_players_to_team = "${aws_apigatewayv2_stage.api_stage.invoke_url}/team/add"
       remove_players_from_team = "${aws_apigatewayv2_stage.api_stage.invoke_url}/team/remove"
     }
+    summary_endpoints = {
+      get_user_summary = "${aws_apigatewayv2_stage.api_stage.invoke_url}/user/{userId}/summary"
+      get_team_summary = "${aws_apigatewayv2_stage.api_stage.invoke_url}/team/{teamId}/summary"
+      get_event_summary = "${aws_apigatewayv2_stage.api_stage.invoke_url}/event/{eventId}/summary"
+    }
     event_registration_endpoints = {
       get_all_registered_events_for_player = "${aws_apigatewayv2_stage.api_stage.invoke_url}/events/registered/{playerId}"
       register_for_event = "${aws_apigatewayv2_stage.api_stage.invoke_url}/event/register"
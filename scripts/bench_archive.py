@@ -0,0 +1,241 @@
+"""
+Archive finished event trees with archive_events.archive_tree and compare what
+get_event costs for an event in the hot tables and the same event once archived:
+
+    python scripts/bench_archive.py --endpoint-url http://localhost:8000 --create-tables \\
+        --events 100 --children 3 --registrations 16 --matches 24 --lookups 200
+
+Seeds --events root events with --children child events each, every event with
+--registrations registrations, --matches matches and one standings row per
+registered team. Half of the trees ended two years ago and are archived; the
+other half stay hot. --endpoint-url is used for both DynamoDB and S3, so a moto
+server (moto_server -p 5000) runs the whole bench locally; without it the run
+goes against the tables named by --table-prefix and --bucket in the configured
+AWS account.
+
+Reports item counts per table before and after archiving, archive_tree
+throughput, and get_event latency (plain and with ?include=children,registrations)
+for the finished events while hot and again once archived. Exits non-zero if a
+hot table keeps rows of an archived tree, loses rows of a hot one, or an
+archived event is not served with all its children and registrations.
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda'))
+
+INCLUDE = 'children,registrations'
+
+
+def configure(args):
+    """Point the handlers at the bench tables and bucket before they are imported"""
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    for name, suffix in (('EVENTS_TABLE', 'events'), ('EVENT_REGISTRATIONS_TABLE', 'event-registrations'),
+                         ('MATCHES_TABLE', 'matches'), ('STANDINGS_TABLE', 'standings'),
+                         ('TEAMS_TABLE', 'teams'), ('USER_TABLE', 'users'),
+                         ('ARCHIVE_INDEX_TABLE', 'archive-index')):
+        os.environ[name] = f'{args.table_prefix}-{suffix}'
+    os.environ['ARCHIVE_BUCKET'] = args.bucket
+    if args.endpoint_url:
+        os.environ['AWS_ENDPOINT_URL_DYNAMODB'] = args.endpoint_url
+        os.environ['AWS_ENDPOINT_URL_S3'] = args.endpoint_url
+
+
+def create_tables(bucket):
+    import boto3
+    client = boto3.client('dynamodb')
+    events_indexes = [
+        {'IndexName': 'parent_event_id-index',
+         'KeySchema': [{'AttributeName': 'parent_event_id', 'KeyType': 'HASH'}],
+         'Projection': {'ProjectionType': 'ALL'}},
+        {'IndexName': 'archive_key-date_end-index',
+         'KeySchema': [{'AttributeName': 'archive_key', 'KeyType': 'HASH'},
+                       {'AttributeName': 'date_end', 'KeyType': 'RANGE'}],
+         'Projection': {'ProjectionType': 'KEYS_ONLY'}}
+    ]
+    definitions = [
+        (os.environ['EVENTS_TABLE'], [('id', 'HASH')], ['parent_event_id', 'archive_key', 'date_end'], events_indexes),
+        (os.environ['EVENT_REGISTRATIONS_TABLE'], [('event_id', 'HASH'), ('team_id', 'RANGE')], [], []),
+        (os.environ['MATCHES_TABLE'], [('event_id', 'HASH'), ('match_id', 'RANGE')], [], []),
+        (os.environ['STANDINGS_TABLE'], [('event_id', 'HASH'), ('team_id', 'RANGE')], [], []),
+        (os.environ['TEAMS_TABLE'], [('id', 'HASH')], [], []),
+        (os.environ['USER_TABLE'], [('user_id', 'HASH')], [], []),
+        (os.environ['ARCHIVE_INDEX_TABLE'], [('event_id', 'HASH')], [], [])
+    ]
+    existing = set(client.list_tables()['TableNames'])
+    for name, keys, indexed, indexes in definitions:
+        if name in existing:
+            continue
+        extra = {'GlobalSecondaryIndexes': indexes} if indexes else {}
+        client.create_table(
+            TableName=name,
+            KeySchema=[{'AttributeName': attribute, 'KeyType': key_type} for attribute, key_type in keys],
+            AttributeDefinitions=[{'AttributeName': attribute, 'AttributeType': 'S'}
+                                  for attribute in [attribute for attribute, _ in keys] + indexed],
+            BillingMode='PAY_PER_REQUEST',
+            **extra
+        )
+        client.get_waiter('table_exists').wait(TableName=name)
+
+    s3 = boto3.client('s3')
+    if bucket not in {b['Name'] for b in s3.list_buckets()['Buckets']}:
+        s3.create_bucket(Bucket=bucket)
+
+
+def seed(args):
+    """Root event ids of the finished trees and of the hot ones"""
+    import boto3
+    import archive
+    dynamodb = boto3.resource('dynamodb')
+    finished, hot = [], []
+    today = date.today()
+    run = uuid.uuid4().hex[:8]
+    teams = [f'T{team:04d}' for team in range(args.registrations)]
+    with contextlib.ExitStack() as stack:
+        events_batch, registrations_batch, matches_batch, standings_batch = [
+            stack.enter_context(dynamodb.Table(os.environ[name]).batch_writer())
+            for name in ('EVENTS_TABLE', 'EVENT_REGISTRATIONS_TABLE', 'MATCHES_TABLE', 'STANDINGS_TABLE')]
+        for index in range(args.events):
+            done = index % 2 == 0
+            date_end = (today - timedelta(days=730) if done else today + timedelta(days=30)).isoformat()
+            root_id = f'bench-{run}-{index:05d}'
+            (finished if done else hot).append(root_id)
+            events = [{'id': root_id, 'name': f'Bench event {index}', 'organizer_id': 'bench-organizer',
+                       'date_end': date_end, 'archive_key': archive.ROOT_ARCHIVE_KEY, 'version': 1}]
+            events += [{'id': f'{root_id}-c{child}', 'name': f'Bench event {index} division {child}',
+                        'organizer_id': 'bench-organizer', 'date_end': date_end, 'parent_event_id': root_id,
+                        'version': 1} for child in range(args.children)]
+            for event in events:
+                events_batch.put_item(Item=event)
+                for team_id in teams:
+                    registrations_batch.put_item(Item={'event_id': event['id'], 'team_id': team_id})
+                    standings_batch.put_item(Item={'event_id': event['id'], 'team_id': team_id, 'points': 0})
+                for match in range(args.matches):
+                    matches_batch.put_item(Item={'event_id': event['id'], 'match_id': f'M{match:06d}', 'status': 'scheduled'})
+    return finished, hot
+
+
+def count_items():
+    """Items per bench table, by paginated COUNT scans"""
+    import boto3
+    client = boto3.client('dynamodb')
+    counts = {}
+    for name in ('EVENTS_TABLE', 'EVENT_REGISTRATIONS_TABLE', 'MATCHES_TABLE', 'STANDINGS_TABLE', 'ARCHIVE_INDEX_TABLE'):
+        kwargs = {'TableName': os.environ[name], 'Select': 'COUNT'}
+        total = 0
+        while True:
+            response = client.scan(**kwargs)
+            total += response['Count']
+            if 'LastEvaluatedKey' not in response:
+                break
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        counts[os.environ[name]] = total
+    return counts
+
+
+def time_lookups(event_ids, lookups, include=None):
+    """get_event latencies in ms over `lookups` calls cycling through `event_ids`, and the last body per event"""
+    import get_event
+    latencies = []
+    bodies = {}
+    for n in range(lookups):
+        event_id = event_ids[n % len(event_ids)]
+        request = {'pathParameters': {'eventId': event_id}, 'queryStringParameters': {'include': include} if include else None}
+        started = time.perf_counter()
+        response = get_event.lambda_handler(request, None)
+        latencies.append((time.perf_counter() - started) * 1000)
+        bodies[event_id] = (response['statusCode'], json.loads(response['body']))
+    return sorted(latencies), bodies
+
+
+def percentile(values, share):
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def describe(label, latencies):
+    print(f"  {label:32} p50 {statistics.median(latencies):7.1f} ms, p95 {percentile(latencies, 0.95):7.1f} ms, "
+          f"max {latencies[-1]:7.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--endpoint-url')
+    # Not bench_standings' tables: the events table here needs the archival indexes
+    parser.add_argument('--table-prefix', default='flag-nation-bench-archive')
+    parser.add_argument('--bucket', default='flag-nation-bench-archive')
+    parser.add_argument('--create-tables', action='store_true')
+    parser.add_argument('--events', type=int, default=100, help='Root events; half of them are archived')
+    parser.add_argument('--children', type=int, default=3)
+    parser.add_argument('--registrations', type=int, default=16)
+    parser.add_argument('--matches', type=int, default=24)
+    parser.add_argument('--lookups', type=int, default=200, help='get_event calls per measurement')
+    args = parser.parse_args(argv)
+
+    configure(args)
+    if args.create_tables:
+        create_tables(args.bucket)
+    finished, hot = seed(args)
+    rows_per_event = {'registrations': args.registrations, 'matches': args.matches, 'standings': args.registrations}
+    events_per_tree = 1 + args.children
+    print(f"seeded {len(finished)} finished and {len(hot)} hot trees of {events_per_tree} events, "
+          f"{sum(rows_per_event.values()) * events_per_tree} rows each")
+
+    import archive_events
+    before = count_items()
+    hot_timings = {label: time_lookups(finished, args.lookups, include)
+                   for label, include in (('plain', None), ('include', INCLUDE))}
+
+    started = time.perf_counter()
+    records = sum(archive_events.archive_tree(root_event_id) for root_event_id in finished)
+    elapsed = time.perf_counter() - started
+    print(f"archive_tree: {len(finished)} trees, {records} records in {elapsed:.2f} s "
+          f"({len(finished) / elapsed:.1f} trees/s, {records / elapsed:,.0f} records/s)")
+
+    after = count_items()
+    archived_timings = {label: time_lookups(finished, args.lookups, include)
+                        for label, include in (('plain', None), ('include', INCLUDE))}
+
+    print("items per table (before -> after):")
+    for name in before:
+        print(f"  {name:48} {before[name]:9} -> {after[name]:9} ({after[name] - before[name]:+})")
+    print("get_event latency for the finished events:")
+    for label in ('plain', 'include'):
+        describe(f'{label}, hot', hot_timings[label][0])
+        describe(f'{label}, archived', archived_timings[label][0])
+
+    failures = []
+    archived_rows = {
+        os.environ['EVENTS_TABLE']: len(finished) * events_per_tree,
+        os.environ['EVENT_REGISTRATIONS_TABLE']: len(finished) * events_per_tree * args.registrations,
+        os.environ['MATCHES_TABLE']: len(finished) * events_per_tree * args.matches,
+        os.environ['STANDINGS_TABLE']: len(finished) * events_per_tree * args.registrations,
+        os.environ['ARCHIVE_INDEX_TABLE']: -len(finished) * events_per_tree
+    }
+    for name, removed in archived_rows.items():
+        if before[name] - after[name] != removed:
+            failures.append(f'{name} changed by {after[name] - before[name]:+}, expected {-removed:+}')
+    for event_id, (status, body) in archived_timings['include'][1].items():
+        if status != 200 or not body.get('archived'):
+            failures.append(f'{event_id} is not served from the archive ({status})')
+        elif archive_events.archive.ARCHIVED_ATTRIBUTE in body['event']:
+            failures.append(f'{event_id} is served with the archival marker')
+        elif (len(body.get('children', [])) != args.children
+              or len(body.get('registrations', [])) != events_per_tree * args.registrations):
+            failures.append(f'{event_id} is served without all its children and registrations')
+    for event_id, (status, body) in time_lookups(hot, len(hot))[1].items():
+        if status != 200 or body.get('archived'):
+            failures.append(f'hot event {event_id} was archived')
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Measure fixture generation and scheduling in lambda/fixtures.py for every
+format at small, medium and large team counts:
+
+    python scripts/bench_fixtures.py --teams 64 512 4096 --venues 16
+
+A round robin of 4096 teams is 8.4 million matches, so the largest size takes
+a while; pass --teams 64 512 for a quick run. Exits non-zero if a format yields
+a different number of matches than count_matches() promises, which is what
+generate_fixtures checks against MAX_MATCHES. Runs locally without AWS.
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda'))
+
+import fixtures  # noqa: E402
+
+
+def best_of(repeat, function):
+    """Best wall time of `repeat` runs and the result of the last one"""
+    best = None
+    for _ in range(repeat):
+        # Like timeit, keep the collector out of the timing; the 8.4M-match round
+        # robin otherwise makes every later run pay for its full collections
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - started
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--teams', type=int, nargs='+', default=[64, 512, 4096])
+    parser.add_argument('--formats', nargs='+', choices=fixtures.FORMATS, default=list(fixtures.FORMATS))
+    parser.add_argument('--venues', type=int, default=16)
+    parser.add_argument('--group-size', type=int, default=4)
+    parser.add_argument('--advance-per-group', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per size; the best one is reported')
+    args = parser.parse_args(argv)
+
+    failures = []
+    for team_count in args.teams:
+        for fixture_format in args.formats:
+            generate_seconds, matches = best_of(args.repeat, lambda: list(fixtures.generate(
+                team_count, fixture_format, args.group_size, args.advance_per_group)))
+            # schedule() writes slot and venue into the dicts; give every run fresh copies
+            schedule_seconds, placed = best_of(args.repeat, lambda: fixtures.schedule(
+                [dict(match) for match in matches], args.venues))
+            expected = fixtures.count_matches(team_count, fixture_format, args.group_size, args.advance_per_group)
+            slots = max(match['slot'] for match in placed) + 1 if placed else 0
+            print(f"{fixture_format:>15} {team_count:5} teams: {len(matches):9} matches, "
+                  f"generate {generate_seconds * 1000:9.1f} ms, schedule {schedule_seconds * 1000:9.1f} ms "
+                  f"({len(matches) / max(generate_seconds + schedule_seconds, 1e-9) / 1e6:.2f} M matches/s), "
+                  f"{slots} slots x {args.venues} venues")
+            if len(matches) != expected:
+                failures.append(f'{fixture_format} with {team_count} teams yields {len(matches)} matches, '
+                                f'count_matches says {expected}')
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
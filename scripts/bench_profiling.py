@@ -0,0 +1,85 @@
+"""
+Check what lambda/profiling.py costs a request in each of its states:
+
+    python scripts/bench_profiling.py --iterations 200000
+
+- disabled (no PROFILE_SECRET, no PROFILE_SAMPLE_RATE): @profiled must return
+  the handler itself, so the overhead is zero by construction
+- armed (secret configured, request without X-Profile): one header lookup
+- profiled (valid X-Profile header): the full sampler and AWS call timer
+
+Exits non-zero if the disabled path is not the bare handler or the armed
+path adds more than --max-armed-overhead-us per request. Runs locally
+without AWS.
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda'))
+
+SECRET = 'bench-secret'
+BODY = json.dumps({'organizer_id': 'user123', 'event_name': 'Soccer Tournament', 'date_start': '2024-06-01'})
+
+
+def handler(event, context):
+    body = json.loads(event['body'])
+    return {'statusCode': 200, 'body': json.dumps({'name': body['event_name']})}
+
+
+def load_profiling(**environment):
+    for name in ('PROFILE_SECRET', 'PROFILE_SAMPLE_RATE'):
+        os.environ.pop(name, None)
+    os.environ.update(environment)
+    import profiling
+    return importlib.reload(profiling)
+
+
+def per_call_us(function, event, iterations):
+    # Best of several repeats filters out scheduler noise
+    return min(timeit.repeat(lambda: function(event, None), number=iterations, repeat=5)) / iterations * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=100000)
+    parser.add_argument('--max-armed-overhead-us', type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    event = {'headers': {'content-type': 'application/json'}, 'body': BODY}
+    bare_us = per_call_us(handler, event, args.iterations)
+    print(f"bare handler:     {bare_us:8.3f} us/request")
+
+    profiling = load_profiling()
+    disabled = profiling.profiled(handler)
+    disabled_us = per_call_us(disabled, event, args.iterations)
+    print(f"disabled:         {disabled_us:8.3f} us/request (returns the handler itself: {disabled is handler})")
+
+    profiling = load_profiling(PROFILE_SECRET=SECRET)
+    armed = profiling.profiled(handler)
+    armed_us = per_call_us(armed, event, args.iterations)
+    print(f"armed, no header: {armed_us:8.3f} us/request (+{armed_us - bare_us:.3f} us)")
+
+    profiled_event = {**event, 'headers': {**event['headers'], 'x-profile': profiling.profile_token(SECRET, 300)}}
+    with contextlib.redirect_stdout(io.StringIO()) as log:
+        profiled_us = per_call_us(armed, profiled_event, max(args.iterations // 1000, 10))
+    print(f"profiled:         {profiled_us:8.3f} us/request (sampler thread start/stop and one log line)")
+    print(f"sample log line:  {log.getvalue().splitlines()[-1][:200]}...")
+
+    failures = []
+    if disabled is not handler:
+        failures.append('the disabled decorator does not return the bare handler')
+    if armed_us - bare_us > args.max_armed_overhead_us:
+        failures.append(f'the armed path adds {armed_us - bare_us:.3f} us per request')
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+"""
+Count the AWS calls that sign-up and sign-in floods cost per rejected attempt:
+
+    python scripts/bench_rate_limit.py --attempts 500 --containers 10
+
+Each flood sends --attempts requests spread over --containers Lambda
+containers. DynamoDB is replaced by an in-memory table behind botocore, so every
+call is counted and nothing leaves the machine (boto3 must be installed, AWS
+credentials are not needed). The floods are:
+
+    create_user      one source IP, each sign-up with a fresh Idempotency-Key;
+                     replayed with the limiter inside @idempotent, the order
+                     create_user used to have, for comparison
+    signin stuffing  one source IP trying a different username every time
+    signin guessing  one username tried from a different source IP every time
+
+Every container lets a subject through its local bucket `burst` times before
+the shared window decides, so the shared counter only rejects once
+--containers x burst exceeds window_limit (20 / 5 for sign-ups, 100 / 20 per IP
+and 10 / 5 per username for sign-ins); the default of 10 containers trips all
+three. Finally a sign-up that succeeded is retried from another container once
+its IP is blocked, and must get the stored response back rather than a 429.
+
+Exits non-zero if a flood's shared counter never rejects, if a rejected
+sign-up writes to the idempotency table or makes more than two AWS calls (the
+shared counter's ADD and the lookup of a stored response), if a rejected
+sign-in looks up the user or makes more than one call per limiter, or if the
+blocked retry is not replayed. That keeps the cost per rejected attempt flat
+however large the flood.
+"""
+import argparse
+import collections
+import contextlib
+import io
+import json
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('USER_TABLE', 'bench-users')
+os.environ.setdefault('RATE_LIMIT_TABLE', 'bench-rate-limits')
+os.environ.setdefault('IDEMPOTENCY_TABLE', 'bench-idempotency')
+
+from botocore.client import BaseClient  # noqa: E402
+
+import create_user  # noqa: E402
+import idempotency  # noqa: E402
+import rate_limit  # noqa: E402
+import signin_user  # noqa: E402
+from validation import validated  # noqa: E402
+
+SOURCE_IP = '203.0.113.7'
+
+
+class StubDynamoDB:
+    """Just enough of DynamoDB for the limiter, the idempotency records, create_user and signin_user"""
+
+    def __init__(self):
+        self.hits = collections.Counter()
+        self.shared_rejections = collections.Counter()  # by limiter scope
+        self.records = {}
+        self.calls = []
+
+    def __call__(self, client, operation_name, api_params):
+        table = api_params.get('TableName')
+        self.calls.append((operation_name, table))
+        if operation_name == 'UpdateItem' and table == rate_limit.rate_limits_table.name:
+            key = api_params['Key']['limit_key']
+            if self.hits[key] >= api_params['ExpressionAttributeValues'][':limit']:
+                self.shared_rejections[key.split('#', 1)[0]] += 1
+                raise self.conditional_check_failed(client, operation_name)
+            self.hits[key] += 1
+        elif operation_name == 'PutItem' and table == idempotency.idempotency_table.name:
+            key = api_params['Item']['idempotency_key']
+            if 'ConditionExpression' in api_params and key in self.records:
+                raise self.conditional_check_failed(client, operation_name)
+            self.records[key] = api_params['Item']
+        elif operation_name == 'DeleteItem' and table == idempotency.idempotency_table.name:
+            self.records.pop(api_params['Key']['idempotency_key'], None)
+        elif operation_name == 'GetItem' and table == idempotency.idempotency_table.name:
+            record = self.records.get(api_params['Key']['idempotency_key'])
+            return {'Item': record} if record else {}
+        elif operation_name == 'Query':
+            return {'Items': [], 'Count': 0}
+        return {}
+
+    @staticmethod
+    def conditional_check_failed(client, operation_name):
+        error = {'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'The conditional request failed'}}
+        return client.exceptions.ConditionalCheckFailedException(error, operation_name)
+
+
+def limiter_inside_idempotent():
+    """create_user with the limiter checked after the idempotency claim, as before"""
+    handler = create_user.lambda_handler
+    while hasattr(handler, '__wrapped__'):
+        handler = handler.__wrapped__
+    limited = rate_limit.rate_limited(create_user.signup_limiter, allow_headers='Content-Type, Idempotency-Key')(handler)
+    return validated(create_user.validate_body, allow_headers='Content-Type, Idempotency-Key')(
+        idempotency.idempotent('create_user')(limited))
+
+
+def sign_up_event(attempt=None):
+    return {
+        'headers': {'content-type': 'application/json', 'idempotency-key': str(uuid.uuid4())},
+        'requestContext': {'http': {'sourceIp': SOURCE_IP}},
+        'body': json.dumps({'username': f'flood-{uuid.uuid4()}', 'password': 'hunter2'})
+    }
+
+
+def stuffing_event(attempt):
+    return {
+        'headers': {'content-type': 'application/json'},
+        'requestContext': {'http': {'sourceIp': SOURCE_IP}},
+        'body': json.dumps({'username': f'victim-{attempt}', 'password': 'hunter2'})
+    }
+
+
+def guessing_event(attempt):
+    return {
+        'headers': {'content-type': 'application/json'},
+        'requestContext': {'http': {'sourceIp': f'198.51.{attempt // 256 % 256}.{attempt % 256}'}},
+        'body': json.dumps({'username': 'victim', 'password': f'guess-{attempt}'})
+    }
+
+
+def quietly(handler, event):
+    # The handler logs every request body; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        return handler(event, None)
+
+
+def flood(handler, stub, make_event, limiters, attempts, containers):
+    """Per-attempt AWS calls of every rejected attempt, and the number of allowed ones"""
+    rejected = []
+    allowed = 0
+    per_container = -(-attempts // containers)
+    for attempt in range(attempts):
+        if attempt % per_container == 0:
+            # A fresh container starts with empty local buckets and caches
+            for limiter in limiters:
+                limiter._buckets.clear()
+            idempotency._local_cache.clear()
+        before = len(stub.calls)
+        response = quietly(handler, make_event(attempt))
+        calls = stub.calls[before:]
+        if response['statusCode'] == 429:
+            rejected.append(calls)
+        else:
+            allowed += 1
+    return rejected, allowed
+
+
+def blocked_retry():
+    """Status of a successful sign-up and of its retry from a fresh container once the IP is blocked"""
+    create_user.signup_limiter._buckets.clear()
+    idempotency._local_cache.clear()
+    signed_up = sign_up_event()
+    first = quietly(create_user.lambda_handler, signed_up)
+    # Every attempt from a fresh container, so only the shared window can reject
+    for _ in range(create_user.signup_limiter.window_limit + 1):
+        create_user.signup_limiter._buckets.clear()
+        if quietly(create_user.lambda_handler, sign_up_event())['statusCode'] == 429:
+            break
+    create_user.signup_limiter._buckets.clear()
+    idempotency._local_cache.clear()
+    return first, quietly(create_user.lambda_handler, signed_up)
+
+
+def summarize(label, rejected, allowed):
+    counts = [len(calls) for calls in rejected]
+    operations = collections.Counter(f"{operation} {table}" for calls in rejected for operation, table in calls)
+    half = len(counts) // 2
+    print(f"{label}: {allowed} allowed, {len(rejected)} rejected, "
+          f"{sum(counts) / max(len(counts), 1):.3f} AWS calls per rejected attempt "
+          f"(first half {sum(counts[:half]) / max(half, 1):.3f}, "
+          f"second half {sum(counts[half:]) / max(len(counts) - half, 1):.3f})")
+    for operation, count in operations.most_common():
+        print(f"    {count:6} x {operation}")
+    return rejected
+
+
+def install(stub):
+    BaseClient._make_api_call = lambda client, operation_name, api_params, stub=stub: \
+        stub(client, operation_name, api_params)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--attempts', type=int, default=500)
+    parser.add_argument('--containers', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    signin_limiters = [signin_user.ip_limiter, signin_user.username_limiter]
+    floods = [
+        ('limiter inside @idempotent', limiter_inside_idempotent(), sign_up_event, [create_user.signup_limiter]),
+        ('create_user (limiter first)', create_user.lambda_handler, sign_up_event, [create_user.signup_limiter]),
+        ('signin_user stuffing', signin_user.lambda_handler, stuffing_event, signin_limiters),
+        ('signin_user guessing', signin_user.lambda_handler, guessing_event, signin_limiters)
+    ]
+    # The limiter whose shared window each flood must trip
+    tripped_by = {
+        'create_user (limiter first)': create_user.signup_limiter,
+        'signin_user stuffing': signin_user.ip_limiter,
+        'signin_user guessing': signin_user.username_limiter
+    }
+
+    original = BaseClient._make_api_call
+    failures = []
+    try:
+        for label, handler, make_event, limiters in floods:
+            stub = StubDynamoDB()
+            install(stub)
+            rejected = summarize(label, *flood(handler, stub, make_event, limiters, args.attempts, args.containers))
+            print(f"    shared window rejections {dict(stub.shared_rejections)}")
+            if handler is create_user.lambda_handler:
+                # Records of allowed attempts may stay behind; rejected ones must not
+                print(f"    {len(stub.records)} idempotency records left")
+                if any(table == idempotency.idempotency_table.name and operation != 'GetItem'
+                       for calls in rejected for operation, table in calls):
+                    failures.append('rejected sign-ups write to the idempotency table')
+                # At most the shared counter's conditional ADD and the stored response lookup;
+                # after the ADD trips the subject is blocked locally
+                if any(len(calls) > 2 for calls in rejected):
+                    failures.append('a rejected sign-up makes more than two AWS calls')
+            elif handler is signin_user.lambda_handler:
+                if any(operation == 'Query' for calls in rejected for operation, _ in calls):
+                    failures.append(f'{label}: rejected sign-ins look up the user')
+                if any(len(calls) > len(limiters) for calls in rejected):
+                    failures.append(f'{label}: a rejected sign-in makes more than one AWS call per limiter')
+            limiter = tripped_by.get(label)
+            if limiter and not stub.shared_rejections[limiter.scope]:
+                failures.append(f'{label}: the shared {limiter.scope} window never rejected; '
+                                f'--containers x {limiter.burst} must exceed {limiter.window_limit}')
+
+        install(StubDynamoDB())
+        first, retry = blocked_retry()
+        print(f"blocked retry of a successful sign-up: {first['statusCode']} then {retry['statusCode']} "
+              f"(replayed: {retry.get('headers', {}).get('Idempotent-Replayed', 'no')})")
+    finally:
+        BaseClient._make_api_call = original
+
+    if first['statusCode'] != retry['statusCode'] or 'Idempotent-Replayed' not in retry.get('headers', {}):
+        failures.append('a blocked retry of a successful sign-up does not get its stored response')
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
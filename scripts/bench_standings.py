@@ -0,0 +1,237 @@
+"""
+Submit match results at a fixed rate through submit_result and check that the
+incrementally maintained standings still match a full rebuild afterwards:
+
+    python scripts/bench_standings.py --endpoint-url http://localhost:8000 --create-tables \\
+        --rate 10000 --duration 60 --workers 16
+    python scripts/bench_standings.py --endpoint-url http://localhost:8000 --create-tables \\
+        --format groups_knockout --teams 8192 --rate 10000 --duration 60 --workers 16
+
+--format round_robin submits league results. --format groups_knockout submits
+group results at the rate, whose handler also reads the group and the knockout
+matches it feeds, then plays the knockout bracket round by round as fast as the
+workers go; a knockout match whose teams were not filled in fails the run.
+
+Every worker is a separate process importing the handler, like a Lambda
+container, and paces its share of the submissions so that together they
+arrive at --rate results per minute. --correction-share of them resubmit an
+earlier match with a new score, which moves the same rows again. Without
+--endpoint-url the run goes against the tables named by --table-prefix in the
+configured AWS account.
+
+moto's server rolls back a cancelled transaction by restoring a copy of every
+table it touched, undoing whatever other workers committed meanwhile; against
+moto use --workers 1, and DynamoDB Local for concurrent runs.
+
+Reports the achieved rate, handler latency and status codes, then runs
+rebuild_standings against the event: any repaired row means an ADD was lost or
+double-counted. Exits non-zero on repaired rows, 5xx responses, or an achieved
+rate more than 5% below --rate.
+"""
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda')
+sys.path.insert(0, LAMBDA_DIR)
+
+ORGANIZER_ID = 'bench-organizer'
+
+
+def configure(args):
+    """Point the handlers at the bench tables; spawned workers inherit the environment"""
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    os.environ['EVENTS_TABLE'] = f'{args.table_prefix}-events'
+    os.environ['MATCHES_TABLE'] = f'{args.table_prefix}-matches'
+    os.environ['STANDINGS_TABLE'] = f'{args.table_prefix}-standings'
+    # generate_fixtures builds the match items but never touches registrations here
+    os.environ['EVENT_REGISTRATIONS_TABLE'] = f'{args.table_prefix}-event-registrations'
+    if args.endpoint_url:
+        os.environ['AWS_ENDPOINT_URL_DYNAMODB'] = args.endpoint_url
+
+
+def create_tables():
+    import boto3
+    client = boto3.client('dynamodb')
+    definitions = [
+        (os.environ['EVENTS_TABLE'], [('id', 'HASH')]),
+        (os.environ['MATCHES_TABLE'], [('event_id', 'HASH'), ('match_id', 'RANGE')]),
+        (os.environ['STANDINGS_TABLE'], [('event_id', 'HASH'), ('team_id', 'RANGE')])
+    ]
+    existing = set(client.list_tables()['TableNames'])
+    for name, keys in definitions:
+        if name in existing:
+            continue
+        client.create_table(
+            TableName=name,
+            KeySchema=[{'AttributeName': attribute, 'KeyType': key_type} for attribute, key_type in keys],
+            AttributeDefinitions=[{'AttributeName': attribute, 'AttributeType': 'S'} for attribute, _ in keys],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        client.get_waiter('table_exists').wait(TableName=name)
+
+
+def seed_event(team_count, fixture_format, venue_count):
+    """An event with generated fixtures and empty standings rows, as generate_fixtures leaves it"""
+    import boto3
+    import fixtures
+    import generate_fixtures
+    import standings
+    dynamodb = boto3.resource('dynamodb')
+    event_id = f'bench-{uuid.uuid4()}'
+    dynamodb.Table(os.environ['EVENTS_TABLE']).put_item(Item={'id': event_id, 'organizer_id': ORGANIZER_ID})
+
+    teams = [{'team_id': f'T{index:04d}', 'team_name': f'Team T{index:04d}'} for index in range(team_count)]
+    scheduled = fixtures.schedule(fixtures.generate(team_count, fixture_format), venue_count)
+    items = generate_fixtures.build_match_items(event_id, scheduled, teams, [f'Field {n}' for n in range(venue_count)], None)
+    with dynamodb.Table(os.environ['MATCHES_TABLE']).batch_writer() as batch:
+        for item in items:
+            batch.put_item(Item=item)
+    with dynamodb.Table(os.environ['STANDINGS_TABLE']).batch_writer() as batch:
+        for row in standings.compute_table(items).values():
+            batch.put_item(Item={'event_id': event_id, **row})
+    return event_id, items
+
+
+def worker(config):
+    """
+    Submit this worker's share of results: its n-th at start_at + (offset + n * stride) * interval,
+    up to `limit` submissions or until its matches run out. Returns (due, started, ms, status) per submission.
+    """
+    import submit_result
+    rng = random.Random(config['seed'])
+    submitted = []
+    results = []
+    fresh = iter(config['match_ids'])
+    while config['limit'] is None or len(results) < config['limit']:
+        due = config['start_at'] + (config['offset'] + len(results) * config['stride']) * config['interval']
+        delay = due - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        match_id = None
+        if submitted and rng.random() < config['correction_share']:
+            match_id = rng.choice(submitted)
+        if match_id is None:
+            match_id = next(fresh, None)
+            if match_id is None:
+                break
+            submitted.append(match_id)
+        # Knockout matches need a winner
+        home_score, away_score = rng.sample(range(6), 2) if config['no_draws'] else (rng.randint(0, 5), rng.randint(0, 5))
+        event = {
+            'pathParameters': {'eventId': config['event_id'], 'matchId': match_id},
+            'body': json.dumps({'organizer_id': ORGANIZER_ID, 'home_score': home_score, 'away_score': away_score})
+        }
+        started = time.time()
+        response = submit_result.lambda_handler(event, None)
+        results.append((due, started, (time.time() - started) * 1000, response['statusCode']))
+    return results
+
+
+def run_phase(pool, args, event_id, match_ids, interval, correction_share=0.0, limit=None, no_draws=False):
+    start_at = time.time() + 0.5
+    configs = [{
+        'event_id': event_id,
+        'match_ids': match_ids[index::args.workers],
+        'start_at': start_at,
+        'interval': interval,
+        'offset': index,
+        'stride': args.workers,
+        'limit': None if limit is None else len(range(index, limit, args.workers)),
+        'correction_share': correction_share,
+        'no_draws': no_draws,
+        'seed': index
+    } for index in range(args.workers)]
+    return start_at, [result for results in pool.map(worker, configs) for result in results]
+
+
+def percentile(values, share):
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--endpoint-url')
+    parser.add_argument('--table-prefix', default='flag-nation-bench')
+    parser.add_argument('--create-tables', action='store_true')
+    parser.add_argument('--format', choices=('round_robin', 'groups_knockout'), default='round_robin')
+    parser.add_argument('--teams', type=int, default=200)
+    parser.add_argument('--venues', type=int, default=16)
+    parser.add_argument('--rate', type=float, default=10000, help='Results per minute')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds (round_robin; groups_knockout plays every group match)')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--correction-share', type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    configure(args)
+    if args.create_tables:
+        create_tables()
+    event_id, items = seed_event(args.teams, args.format, args.venues)
+    table_ids = [item['match_id'] for item in items if item['stage'] != 'knockout']
+    knockout_rounds = collections.defaultdict(list)
+    for item in items:
+        if item['stage'] == 'knockout':
+            knockout_rounds[item['round']].append(item['match_id'])
+
+    limit = None
+    if args.format == 'round_robin':
+        limit = int(args.rate * args.duration / 60)
+        if len(table_ids) < limit:
+            raise SystemExit(f'{args.teams} teams only have {len(table_ids)} matches for {limit} submissions; raise --teams')
+    print(f"event {event_id}: {args.teams} teams, {len(table_ids)} {args.format} table matches, "
+          f"{sum(map(len, knockout_rounds.values()))} knockout matches")
+
+    # Workers import the handler once and serve every phase, like warm containers
+    with multiprocessing.get_context('spawn').Pool(args.workers) as pool:
+        start_at, results = run_phase(pool, args, event_id, table_ids, 60 / args.rate, args.correction_share, limit)
+        knockout_results = []
+        for rnd in sorted(knockout_rounds):
+            knockout_results += run_phase(pool, args, event_id, knockout_rounds[rnd], 0, no_draws=True)[1]
+
+    latencies = sorted(ms for _, _, ms, _ in results)
+    lateness = sorted(started - due for due, started, _, _ in results)
+    statuses = collections.Counter(status for _, _, _, status in results)
+    elapsed = max(started + ms / 1000 for _, started, ms, _ in results) - start_at
+    achieved = len(results) / elapsed * 60
+    print(f"{len(results)} results, achieved {achieved:,.0f} results/min (target {args.rate:,.0f}), "
+          f"statuses {dict(sorted(statuses.items()))}")
+    print(f"latency p50 {statistics.median(latencies):.1f} ms, p95 {percentile(latencies, 0.95):.1f} ms, "
+          f"p99 {percentile(latencies, 0.99):.1f} ms, max {latencies[-1]:.1f} ms; "
+          f"start lag p99 {percentile(lateness, 0.99) * 1000:.0f} ms")
+    knockout_statuses = collections.Counter(status for _, _, _, status in knockout_results)
+    if knockout_results:
+        knockout_latencies = sorted(ms for _, _, ms, _ in knockout_results)
+        print(f"knockout: {len(knockout_results)} results over {len(knockout_rounds)} rounds, "
+              f"statuses {dict(sorted(knockout_statuses.items()))}, latency p50 {statistics.median(knockout_latencies):.1f} ms")
+
+    import rebuild_standings
+    started = time.perf_counter()
+    repaired, conflicts, filled = rebuild_standings.rebuild(event_id)
+    print(f"rebuild: {len(repaired)} rows repaired, {len(conflicts)} skipped, {len(filled)} participants filled, "
+          f"{(time.perf_counter() - started) * 1000:.0f} ms")
+
+    failures = []
+    if repaired:
+        failures.append(f'{len(repaired)} standings rows had drifted from the results')
+    if filled:
+        failures.append(f'{len(filled)} decided participants had not been advanced')
+    if any(status >= 500 for status in statuses):
+        failures.append('submissions failed with 5xx')
+    if any(status != 200 for status in knockout_statuses):
+        failures.append('knockout matches were not playable; their teams were not filled in')
+    if achieved < 0.95 * args.rate:
+        failures.append(f'achieved only {achieved:,.0f} results/min')
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Measure the per-request cost of lambda/validation.py against a naive validator
+that walks the same schema dict on every request:
+
+    python scripts/bench_validation.py --iterations 200000
+
+Runs locally without AWS; the schema mirrors create_event's.
+"""
+import argparse
+import datetime
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda'))
+
+from validation import compile_schema  # noqa: E402
+
+SCHEMA = {
+    'organizer_id': {'type': 'string', 'required': True, 'max_length': 128},
+    'event_name': {'type': 'string', 'required': True, 'max_length': 200},
+    'date_start': {'type': 'date'},
+    'date_end': {'type': 'date'},
+    'parent_event_id': {'type': 'string', 'max_length': 128},
+    'location': {'type': 'string', 'max_length': 500},
+    'additional_info': {'type': 'string', 'max_length': 5000}
+}
+
+BODIES = {
+    'valid': {
+        'organizer_id': 'a6c1f1f4-8d3e-4c55-9a55-0d1c6a1d2f10',
+        'event_name': 'Soccer Tournament',
+        'date_start': '2024-06-01',
+        'date_end': '2024-06-03',
+        'location': 'Central Park',
+        'additional_info': 'Bring your own water bottle'
+    },
+    'invalid': {
+        'event_name': 42,
+        'date_start': '06/01/2024',
+        'location': 'x' * 600
+    }
+}
+
+
+def naive_validate(schema, body):
+    """Interpret the schema dict per request, the way ad hoc validation usually grows"""
+    errors = []
+    for name, spec in schema.items():
+        value = body.get(name)
+        if value is None or value == '':
+            if spec.get('required'):
+                errors.append({'field': name, 'message': 'is required'})
+            continue
+        if spec['type'] in ('string', 'date') and not isinstance(value, str):
+            errors.append({'field': name, 'message': 'must be a string'})
+            continue
+        if spec['type'] == 'date':
+            try:
+                datetime.datetime.fromisoformat(value)
+            except ValueError:
+                errors.append({'field': name, 'message': 'must be a date'})
+                continue
+        if 'max_length' in spec and len(value) > spec['max_length']:
+            errors.append({'field': name, 'message': f"must have at most {spec['max_length']} characters"})
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    compile_seconds = timeit.timeit(lambda: compile_schema(SCHEMA), number=1000) / 1000
+    print(f"compile_schema: {compile_seconds * 1e6:.1f} us once per container")
+
+    compiled = compile_schema(SCHEMA)
+    for label, body in BODIES.items():
+        compiled_seconds = timeit.timeit(lambda: compiled(body), number=args.iterations) / args.iterations
+        naive_seconds = timeit.timeit(lambda: naive_validate(SCHEMA, body), number=args.iterations) / args.iterations
+        print(f"{label:>8}: compiled {compiled_seconds * 1e6:.2f} us/request, "
+              f"naive {naive_seconds * 1e6:.2f} us/request ({naive_seconds / compiled_seconds:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Measure first-request latency of a handler in fresh processes, with and
+without a warm-up ping before the request:
+
+    python scripts/bench_warmup.py --handler get_event \\
+        --event '{"pathParameters": {"eventId": "event123"}}' \\
+        --env EVENTS_TABLE=flag-nation-test-events --env ARCHIVE_INDEX_TABLE=flag-nation-test-archive-index \\
+        --env EVENT_REGISTRATIONS_TABLE=flag-nation-test-event-registrations \\
+        --env TEAMS_TABLE=flag-nation-test-teams --env ARCHIVE_BUCKET=unused --runs 10
+
+Every run imports the handler in a new interpreter, like a cold Lambda
+container, so import time, client creation and the first TLS handshake are all
+paid again. Pass --endpoint-url http://localhost:8000 to run against DynamoDB
+Local (needs a boto3 that honours AWS_ENDPOINT_URL_DYNAMODB).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda')
+
+CHILD = r'''
+import importlib
+import json
+import sys
+import time
+
+config = json.loads(sys.argv[1])
+sys.path.insert(0, config['lambda_dir'])
+started = time.perf_counter()
+module = importlib.import_module(config['handler'])
+import_ms = (time.perf_counter() - started) * 1000
+
+prime_ms = None
+if config['prime']:
+    started = time.perf_counter()
+    # Same shape as the EventBridge input in main.tf
+    request_context = json.loads(config['event']).get('requestContext', {})
+    module.lambda_handler({'warmup': True, 'requestContext': request_context}, None)
+    prime_ms = (time.perf_counter() - started) * 1000
+    time.sleep(config['pause'])
+
+timings = []
+for _ in range(2):
+    started = time.perf_counter()
+    response = module.lambda_handler(json.loads(config['event']), None)
+    timings.append((time.perf_counter() - started) * 1000)
+
+print(json.dumps({
+    'import_ms': import_ms,
+    'prime_ms': prime_ms,
+    'first_ms': timings[0],
+    'second_ms': timings[1],
+    'status': response.get('statusCode') if isinstance(response, dict) else None
+}))
+'''
+
+
+def run_once(args, prime):
+    env = dict(os.environ)
+    for pair in args.env:
+        name, _, value = pair.partition('=')
+        env[name] = value
+    if args.endpoint_url:
+        env['AWS_ENDPOINT_URL_DYNAMODB'] = args.endpoint_url
+    config = {
+        'lambda_dir': LAMBDA_DIR,
+        'handler': args.handler,
+        'event': args.event,
+        'prime': prime,
+        'pause': args.pause
+    }
+    result = subprocess.run([sys.executable, '-c', CHILD, json.dumps(config)],
+                            env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"{args.handler} failed:\n{result.stderr}")
+    # The handler's own log lines come first; the measurement is the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(label, runs):
+    first = [run['first_ms'] for run in runs]
+    second = [run['second_ms'] for run in runs]
+    line = (f"{label:>9}: first request median {statistics.median(first):7.1f} ms "
+            f"(max {max(first):7.1f}), second {statistics.median(second):6.1f} ms, "
+            f"import {statistics.median(run['import_ms'] for run in runs):6.1f} ms")
+    if runs[0]['prime_ms'] is not None:
+        line += f", warm-up ping {statistics.median(run['prime_ms'] for run in runs):6.1f} ms"
+    print(line + f", status {runs[-1]['status']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--handler', required=True, help='Module name in lambda/, e.g. get_event')
+    parser.add_argument('--event', default='{}', help='JSON event passed to the handler')
+    parser.add_argument('--env', action='append', default=[], help='NAME=VALUE for the handler environment')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--pause', type=float, default=0.0, help='Seconds between the ping and the request')
+    parser.add_argument('--endpoint-url')
+    args = parser.parse_args(argv)
+
+    # Interleave so drift in network conditions affects both sides equally
+    cold, primed = [], []
+    for _ in range(args.runs):
+        cold.append(run_once(args, prime=False))
+        primed.append(run_once(args, prime=True))
+    summarize('cold', cold)
+    summarize('primed', primed)
+
+
+if __name__ == '__main__':
+    main()